@@ -0,0 +1,356 @@
+"""Benchmark the receive path of the RFXtrx integration.
+
+Synthetic Lighting4, RFY, BlindsT19 and temperature/humidity frames are fed
+through a fake transport into a Home Assistant instance running the
+integration from this repository, with the given number of configured
+devices. Frames take the same path as on a live RFXtrx: the reader thread
+of pyRFXtrx, the receive queue, async_handle_receive and the _handle_event
+method of the entities. No RFXtrx hardware is needed.
+
+Reported per run are the frames handled per second, the process CPU time
+per frame, the 95th percentile of the receive latency and the net number
+of memory blocks allocated per frame. Frames are received as one burst
+unless a rate is given, so by default the latency includes the time spent
+queued behind earlier frames.
+
+    python benchmarks/receive_benchmark.py --devices 10 100 1000 --frames 5000
+
+A file recorded with the capture service can be replayed instead, with
+the devices seen in it configured:
+
+    python benchmarks/receive_benchmark.py --capture rfxtrx_capture.bin --speed 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from functools import partial
+import importlib
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import RFXtrx as rfxtrxmod
+
+from homeassistant import bootstrap, config_entries, core, loader
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOMAIN = "rfxtrx"
+
+DEFAULT_DEVICES = (10, 100, 1000)
+DEFAULT_FRAMES = 5000
+
+# Seconds without a new frame before a run is given up
+DEFAULT_STALL_TIMEOUT = 30.0
+
+
+def lighting4_code(index: int) -> str:
+    """Return the event code of a Lighting4 (PT2262) device."""
+    return f"09130000{0x100000 + index:06x}013970"
+
+
+def rfy_code(index: int) -> str:
+    """Return the event code of a Somfy RFY device."""
+    return f"071a0000{0x010000 + index:06x}01"
+
+
+def blindst19_code(index: int) -> str:
+    """Return the event code of a Louvolite BlindsT19 device."""
+    return f"09191300{0x020000 + index:06x}010070"
+
+
+def sensor_code(index: int) -> str:
+    """Return the event code of a temperature and humidity sensor."""
+    return f"0a520800{index:04x}0b0f210059"
+
+
+KINDS = {
+    "lighting4": lighting4_code,
+    "rfy": rfy_code,
+    "blindst19": blindst19_code,
+    "sensor": sensor_code,
+}
+
+
+class FakeTransport(rfxtrxmod.RFXtrxTransport):
+    """Transport returning prepared frames once started."""
+
+    def __init__(self, frames: list[bytes], rate: float = 0.0) -> None:
+        """Initialize the transport with the raw frames and frames per second."""
+        self.frames = frames
+        self.interval = 1 / rate if rate else 0.0
+        self.started = threading.Event()
+        self._closed = threading.Event()
+        self._handshake = 2
+
+    def connect(self, timeout: float | None = None) -> None:
+        """Connect to nothing."""
+
+    def reset(self) -> None:
+        """Reset nothing."""
+
+    def send(self, data: bytes | bytearray) -> None:
+        """Drop the data."""
+
+    def close(self) -> None:
+        """Stop receiving."""
+        self._closed.set()
+        self.started.set()
+
+    def receive_blocking(self) -> rfxtrxmod.RFXtrxEvent | None:
+        """Return the next frame once started."""
+        if self._handshake:
+            # Replies to the status and start commands
+            self._handshake -= 1
+            return None
+        self.started.wait()
+        if self.interval:
+            time.sleep(self.interval)
+        if self.frames and not self._closed.is_set():
+            return self.parse(bytearray(self.frames.pop()))
+        self._closed.wait()
+        return None
+
+
+def build_devices(count: int, kinds: list[str]) -> list[str]:
+    """Return the event codes of the configured devices."""
+    return [KINDS[kinds[index % len(kinds)]](index) for index in range(count)]
+
+
+def build_frames(codes: list[str], count: int) -> list[bytes]:
+    """Return frames cycling over the devices, last frame first."""
+    frames = []
+    for index in range(count):
+        frame = bytearray.fromhex(codes[index % len(codes)])
+        frame[3] = index & 0xFF
+        frames.append(bytes(frame))
+    frames.reverse()
+    return frames
+
+
+def read_capture_devices(path: str) -> tuple[list[str], int]:
+    """Return the event codes of the devices in a capture and its frame count."""
+    # Imported here as custom_components is only importable once set up
+    from custom_components.rfxtrx.capture import Direction, read_capture
+
+    codes: dict[tuple[int, int, str], str] = {}
+    frame_count = 0
+    for frame in read_capture(path):
+        if frame.direction != Direction.RECEIVED:
+            continue
+        event = rfxtrxmod.RFXtrxTransport.parse(bytearray(frame.data))
+        if event is None:
+            continue
+        frame_count += 1
+        if event.device.id_string:
+            device = (event.device.packettype, event.device.subtype)
+            codes.setdefault((*device, event.device.id_string), frame.data.hex())
+    return list(codes.values()), frame_count
+
+
+def create_replay_transport(path: str, speed: float) -> rfxtrxmod.RFXtrxTransport:
+    """Return a replay transport holding the frames until started."""
+    from custom_components.rfxtrx.replay import ReplayTransport
+
+    class GatedReplayTransport(ReplayTransport):
+        """Replay transport waiting to be started after the handshake."""
+
+        def __init__(self) -> None:
+            super().__init__(path, speed)
+            self.started = threading.Event()
+
+        def close(self) -> None:
+            super().close()
+            self.started.set()
+
+        def receive_blocking(self) -> rfxtrxmod.RFXtrxEvent | None:
+            if not self._replies:
+                self.started.wait()
+            return super().receive_blocking()
+
+    return GatedReplayTransport()
+
+
+async def async_start_hass(config_dir: str) -> core.HomeAssistant:
+    """Start a Home Assistant instance loading the integration from the repo."""
+    # Start from empty registries
+    shutil.rmtree(os.path.join(config_dir, ".storage"), ignore_errors=True)
+    hass = core.HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def async_run(
+    config_dir: str,
+    codes: list[str],
+    frame_count: int,
+    create_transport: Callable[[], rfxtrxmod.RFXtrxTransport],
+    stall_timeout: float = DEFAULT_STALL_TIMEOUT,
+) -> dict:
+    """Set up the integration with the devices and receive the frames.
+
+    Raises TimeoutError if no frame arrives for stall_timeout seconds,
+    e.g. because a frame was dropped.
+    """
+    hass = await async_start_hass(config_dir)
+    try:
+        module = importlib.import_module(f"custom_components.{DOMAIN}")
+        transport = create_transport()
+
+        def _create_rfx(config, event_callback, capture=None):
+            rfx = rfxtrxmod.Connect(transport, event_callback)
+            rfx.connect()
+            return rfx
+
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="RFXtrx benchmark",
+            data={
+                "host": None,
+                "port": None,
+                "device": "/dev/null",
+                "automatic_add": False,
+                "devices": {code: {} for code in codes},
+            },
+            source=config_entries.SOURCE_USER,
+        )
+        with patch.object(module, "_create_rfx", _create_rfx):
+            await hass.config_entries.async_add(entry)
+            await hass.async_block_till_done()
+
+            metrics = hass.data[DOMAIN]["receive_metrics"]
+            blocks = sys.getallocatedblocks()
+            cpu = time.process_time()
+            start = time.perf_counter()
+            transport.started.set()
+            received = metrics.frames
+            last_progress = time.monotonic()
+            while metrics.frames < frame_count:
+                await asyncio.sleep(0.001)
+                if metrics.frames != received:
+                    received = metrics.frames
+                    last_progress = time.monotonic()
+                elif time.monotonic() - last_progress > stall_timeout:
+                    raise TimeoutError(
+                        f"Received {received} of {frame_count} frames, "
+                        f"none in the last {stall_timeout:g} s"
+                    )
+            elapsed = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+            blocks = sys.getallocatedblocks() - blocks
+
+            result = {
+                "devices": len(codes),
+                "entities": len(hass.states.async_all()),
+                "frames": frame_count,
+                "frames_per_second": frame_count / elapsed,
+                "cpu_us_per_frame": cpu / frame_count * 1e6,
+                "p95_latency_ms": metrics.as_dict()["latency"]["total"]["p95_ms"],
+                "blocks_per_frame": blocks / frame_count,
+            }
+
+            await hass.config_entries.async_unload(entry.entry_id)
+    finally:
+        await hass.async_stop(force=True)
+    return result
+
+
+def main() -> None:
+    """Run the benchmark for each device count and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=list(DEFAULT_DEVICES))
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--kinds", nargs="+", choices=list(KINDS), default=list(KINDS))
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="frames per second, 0 for a burst"
+    )
+    parser.add_argument(
+        "--capture", help="replay the received frames of a capture file instead"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="replay speed of the capture, 1 for its timing, 0 for a burst",
+    )
+    parser.add_argument(
+        "--stall-timeout",
+        type=float,
+        default=DEFAULT_STALL_TIMEOUT,
+        help="seconds without a new frame before a run fails",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    print(
+        f"{'devices':>8} {'entities':>8} {'frames':>8} {'frames/s':>10} "
+        f"{'cpu us/frame':>12} {'p95 ms':>8} {'blocks/frame':>12}"
+    )
+    with tempfile.TemporaryDirectory() as config_dir:
+        # Custom components stay imported from this directory between runs
+        os.symlink(
+            os.path.join(REPO_DIR, "custom_components"),
+            os.path.join(config_dir, "custom_components"),
+        )
+        sys.path.insert(0, config_dir)
+
+        runs: list[tuple[list[str], int, Callable[[], rfxtrxmod.RFXtrxTransport]]]
+        if args.capture:
+            codes, frame_count = read_capture_devices(args.capture)
+            runs = [
+                (
+                    codes,
+                    frame_count,
+                    partial(create_replay_transport, args.capture, args.speed),
+                )
+            ]
+        else:
+            runs = []
+            for device_count in args.devices:
+                codes = build_devices(device_count, args.kinds)
+                frames = build_frames(codes, args.frames)
+                runs.append(
+                    (
+                        codes,
+                        args.frames,
+                        partial(FakeTransport, frames, args.rate),
+                    )
+                )
+
+        for codes, frame_count, create_transport in runs:
+            try:
+                result = asyncio.run(
+                    async_run(
+                        config_dir,
+                        codes,
+                        frame_count,
+                        create_transport,
+                        args.stall_timeout,
+                    )
+                )
+            except TimeoutError as err:
+                sys.exit(f"Benchmark stalled: {err}")
+            print(
+                f"{result['devices']:>8} {result['entities']:>8} "
+                f"{result['frames']:>8} {result['frames_per_second']:>10.0f} "
+                f"{result['cpu_us_per_frame']:>12.1f} "
+                f"{result['p95_latency_ms']:>8.2f} "
+                f"{result['blocks_per_frame']:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
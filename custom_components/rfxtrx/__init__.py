@@ -1,10 +1,13 @@
 """Support for RFXtrx devices."""
 from __future__ import annotations
 
+import asyncio
 import binascii
-from collections.abc import Callable, Mapping
-import copy
+from collections import OrderedDict, deque
+from collections.abc import Callable, Collection, Iterable, Mapping
 import logging
+import threading
+import time
 from typing import Any, NamedTuple, TypeVarTuple, cast
 
 import RFXtrx as rfxtrxmod
@@ -21,7 +24,13 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -31,25 +40,60 @@ from homeassistant.helpers.dispatcher import (
 )
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.loader import async_get_integration
 
+from .capture import CAPTURE_FILENAME, CaptureTransport, FrameCapture
 from .const import (
+    ATTR_COMPRESS,
+    ATTR_ENABLED,
     ATTR_EVENT,
     COMMAND_GROUP_LIST,
     CONF_AUTOMATIC_ADD,
     CONF_DATA_BITS,
+    CONF_DEDUPE_WINDOW,
     CONF_PROTOCOLS,
-    DATA_RFXOBJECT,
+    CONF_REPLAY_PATH,
+    CONF_REPLAY_SPEED,
+    CONF_SUPPRESSED_EVENT_TYPES,
+    CONF_TRANSMIT_GAP,
+    DATA_CAPTURE,
+    DATA_CONNECTION,
+    DATA_DEDUPLICATOR,
+    DATA_EVENT_ROUTER,
+    DATA_PARSED_DEVICES,
+    DATA_PLATFORM_DEVICES,
+    DATA_RECEIVE_METRICS,
+    DATA_RECEIVE_QUEUE,
+    DATA_TRANSMITTER,
     DEVICE_PACKET_TYPE_LIGHTING4,
     DOMAIN,
     EVENT_RFXTRX_EVENT,
+    SERVICE_CAPTURE,
     SERVICE_SEND,
 )
+from .metrics import ReceiveMetrics, RequestMetrics
+from .replay import ReplayTransport
+from .transmit import (
+    TIMED_SEND_LEAD,
+    URGENT_COMMANDS,
+    RfxtrxTransmitter,
+    TransmitPriority,
+    TransmitTiming,
+    send_raw,
+)
 
 DEFAULT_OFF_DELAY = 2.0
 
 SIGNAL_EVENT = f"{DOMAIN}_event"
 CONNECT_TIMEOUT = 30.0
+SETUP_CONNECT_WAIT = 2.0
+PT2262_MAX_DEVICE_IDS = 256
+DEDUPE_PRUNE_SIZE = 256
+SAVE_DEVICES_DELAY = 5.0
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
 
 _Ts = TypeVarTuple("_Ts")
 
@@ -64,6 +108,14 @@ class DeviceTuple(NamedTuple):
     id_string: str
 
 
+class ParsedDevice(NamedTuple):
+    """A configured device with its parsed packet."""
+
+    event: rfxtrxmod.RFXtrxEvent
+    device_id: DeviceTuple
+    config: dict[str, Any]
+
+
 def _bytearray_string(data: Any) -> bytearray:
     val = cv.string(data)
     try:
@@ -74,7 +126,181 @@ def _bytearray_string(data: Any) -> bytearray:
         ) from err
 
 
+EventHandler = Callable[[rfxtrxmod.RFXtrxEvent, DeviceTuple], None]
+Classifier = Callable[[rfxtrxmod.RFXtrxEvent], list[Platform]]
+
+
+class RfxtrxEventRouter:
+    """Route received events to the entities they apply to.
+
+    Entities register against their device id and group id, so a received
+    frame only reaches the entities it may apply to instead of every entity
+    of the integration.
+    """
+
+    def __init__(self, metrics: ReceiveMetrics) -> None:
+        """Initialize the router."""
+        self._metrics = metrics
+        self._devices: dict[DeviceTuple, list[EventHandler]] = {}
+        self._groups: dict[str, list[EventHandler]] = {}
+
+    @callback
+    def async_register(
+        self, device_id: DeviceTuple, group_id: str, handler: EventHandler
+    ) -> CALLBACK_TYPE:
+        """Register a handler for events of a device and its group."""
+        self._devices.setdefault(device_id, []).append(handler)
+        self._groups.setdefault(group_id, []).append(handler)
+
+        @callback
+        def _async_unregister() -> None:
+            _remove_handler(self._devices, device_id, handler)
+            _remove_handler(self._groups, group_id, handler)
+
+        return _async_unregister
+
+    @callback
+    def async_route(
+        self, event: rfxtrxmod.RFXtrxEvent, device_id: DeviceTuple
+    ) -> None:
+        """Pass an event to the handlers it may apply to."""
+        handlers = self._devices.get(device_id, [])
+        if (group_id := get_group_id(event)) is not None and (
+            group_handlers := self._groups.get(group_id)
+        ):
+            handlers = handlers + [x for x in group_handlers if x not in handlers]
+
+        metrics = self._metrics
+        for handler in tuple(handlers):
+            start = time.monotonic()
+            written = metrics.state_write.total
+            metrics.receiving = True
+            try:
+                handler(event, device_id)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling event for %s", device_id)
+            finally:
+                metrics.receiving = False
+            # The state write is recorded by the entity, leave it out
+            metrics.apply.record(
+                time.monotonic() - start - (metrics.state_write.total - written)
+            )
+
+
+class FrameDeduplicator:
+    """Drop repeated copies of a frame received within a time window.
+
+    Remotes and sensors send every frame several times. The sequence number
+    assigned by the RFXtrx and the signal level nibble differ between copies,
+    so they are left out of the key a frame is compared on.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the deduplicator with a window in seconds."""
+        self.window = window
+        self._seen: dict[bytes, float] = {}
+
+    @callback
+    def async_is_duplicate(self, data: bytes | bytearray, now: float) -> bool:
+        """Return if a frame repeats one seen within the window."""
+        if self.window <= 0 or len(data) < 5:
+            return False
+
+        key = bytes(data[:3]) + bytes(data[4:-1]) + bytes((data[-1] & 0x0F,))
+        last_seen = self._seen.get(key)
+        self._seen[key] = now
+        if last_seen is not None and now - last_seen < self.window:
+            return True
+
+        if len(self._seen) > DEDUPE_PRUNE_SIZE:
+            self._seen = {
+                key: seen
+                for key, seen in self._seen.items()
+                if now - seen < self.window
+            }
+        return False
+
+
+class RfxtrxReceiveQueue:
+    """Hand received events from the reader thread to the event loop.
+
+    The reader thread only appends to a queue, and the loop is woken once
+    for each batch of events queued while it was busy instead of once for
+    every event.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        handler: Callable[[rfxtrxmod.RFXtrxEvent, float], None],
+    ) -> None:
+        """Initialize the queue.
+
+        The handler is called with each event and the monotonic time it
+        was received at.
+        """
+        self._hass = hass
+        self._handler = handler
+        self._lock = threading.Lock()
+        self._events: deque[tuple[float, rfxtrxmod.RFXtrxEvent]] = deque()
+        self._scheduled = False
+        self.batches = 0
+        self.events = 0
+        self.max_batch_size = 0
+
+    def put(self, event: rfxtrxmod.RFXtrxEvent) -> None:
+        """Queue an event, called from the reader thread."""
+        with self._lock:
+            self._events.append((time.monotonic(), event))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._hass.loop.call_soon_threadsafe(self._async_drain)
+
+    @callback
+    def _async_drain(self) -> None:
+        """Handle all queued events."""
+        with self._lock:
+            events = self._events
+            self._events = deque()
+            self._scheduled = False
+
+        self.batches += 1
+        self.events += len(events)
+        self.max_batch_size = max(self.max_batch_size, len(events))
+        for received, event in events:
+            try:
+                self._handler(event, received)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error handling received event %s", event)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the queue statistics."""
+        return {
+            "batches": self.batches,
+            "events": self.events,
+            "max_batch_size": self.max_batch_size,
+        }
+
+
+def _remove_handler(
+    handlers: dict[Any, list[EventHandler]], key: Any, handler: EventHandler
+) -> None:
+    """Remove a handler from an index, dropping empty entries."""
+    if (registered := handlers.get(key)) is None:
+        return
+    registered.remove(handler)
+    if not registered:
+        del handlers[key]
+
+
 SERVICE_SEND_SCHEMA = vol.Schema({ATTR_EVENT: _bytearray_string})
+SERVICE_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENABLED): cv.boolean,
+        vol.Optional(ATTR_COMPRESS, default=False): cv.boolean,
+    }
+)
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
@@ -86,6 +312,133 @@ PLATFORMS = [
 ]
 
 
+class RfxtrxConnection:
+    """Connection to the RFXtrx, made and replaced in the background.
+
+    Setup does not wait for the handshake with the RFXtrx, and a lost
+    connection is replaced under the running entities. The transmitter
+    holds commands while there is no connection.
+
+    Setup only waits a moment for the first attempt, so a wrong device
+    path or host still fails setup instead of retrying unnoticed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        event_callback: Callable[[rfxtrxmod.RFXtrxEvent], None],
+        transmitter: RfxtrxTransmitter,
+        capture: FrameCapture,
+    ) -> None:
+        """Initialize the connection."""
+        self._hass = hass
+        self._entry = entry
+        self._event_callback = event_callback
+        self._transmitter = transmitter
+        self._capture = capture
+        self._task: asyncio.Task[None] | None = None
+        self._connect_needed = False
+        self._first_attempt: asyncio.Future[Exception | None] | None = None
+        self.rfx_object: rfxtrxmod.Connect | None = None
+        self.connects = 0
+
+    @property
+    def transport(self) -> rfxtrxmod.RFXtrxTransport:
+        """Return the transport of the current connection."""
+        if self.rfx_object is None:
+            raise rfxtrxmod.RFXtrxTransportError("Not connected")
+        return self.rfx_object.transport
+
+    async def async_start(self) -> None:
+        """Connect in the background, failing if the first attempt fails quickly.
+
+        Raises ConfigEntryNotReady if the first attempt fails within
+        SETUP_CONNECT_WAIT. A slower first attempt is left to carry on.
+        """
+        first_attempt = self._first_attempt = self._hass.loop.create_future()
+        self.async_connect()
+        await asyncio.wait([first_attempt], timeout=SETUP_CONNECT_WAIT)
+        self._first_attempt = None
+        if first_attempt.done() and (err := first_attempt.result()) is not None:
+            await self.async_close()
+            raise ConfigEntryNotReady(
+                f"Unable to connect to the RFXtrx: {err}"
+            ) from err
+
+    @callback
+    def async_connect(self) -> None:
+        """Replace the connection in the background."""
+        self._connect_needed = True
+        if self._task is not None and not self._task.done():
+            return
+        self._transmitter.async_pause()
+        self._task = self._entry.async_create_background_task(
+            self._hass, self._async_connect(), f"{DOMAIN} connect"
+        )
+
+    async def async_close(self) -> None:
+        """Stop connecting and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.rfx_object is not None:
+            await self._hass.async_add_executor_job(self.close)
+
+    def close(self) -> None:
+        """Close the connection."""
+        if (rfx_object := self.rfx_object) is not None:
+            self.rfx_object = None
+            rfx_object.close_connection()
+
+    async def _async_connect(self) -> None:
+        """Connect, backing off exponentially between attempts."""
+        delay = RECONNECT_MIN_DELAY
+        while self._connect_needed:
+            self._connect_needed = False
+            if self.rfx_object is not None:
+                await self._hass.async_add_executor_job(self.close)
+
+            future = self._hass.async_add_executor_job(
+                _create_rfx, self._entry.data, self._event_callback, self._capture
+            )
+            try:
+                self.rfx_object = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                future.add_done_callback(self._close_abandoned)
+                raise
+            except ConfigEntryNotReady as err:
+                if self._set_first_attempt(err):
+                    # Setup fails and reports the error
+                    return
+                _LOGGER.warning(
+                    "Unable to connect to the RFXtrx, retrying in %s s: %s",
+                    delay,
+                    err,
+                )
+                self._connect_needed = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+        self._set_first_attempt(None)
+        self.connects += 1
+        self._transmitter.async_resume()
+        _LOGGER.debug("Connected to the RFXtrx")
+
+    def _set_first_attempt(self, err: Exception | None) -> bool:
+        """Report the outcome of the first attempt to a waiting setup."""
+        if self._first_attempt is None or self._first_attempt.done():
+            return False
+        self._first_attempt.set_result(err)
+        return True
+
+    def _close_abandoned(self, future: asyncio.Future[rfxtrxmod.Connect]) -> None:
+        """Close a connection completed after connecting was cancelled."""
+        if not future.cancelled() and future.exception() is None:
+            self._hass.async_add_executor_job(future.result().close_connection)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the RFXtrx component."""
     hass.data.setdefault(DOMAIN, {})
@@ -102,9 +455,13 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     hass.services.async_remove(DOMAIN, SERVICE_SEND)
+    hass.services.async_remove(DOMAIN, SERVICE_CAPTURE)
 
-    rfx_object = hass.data[DOMAIN][DATA_RFXOBJECT]
-    await hass.async_add_executor_job(rfx_object.close_connection)
+    await hass.data[DOMAIN][DATA_TRANSMITTER].async_stop()
+
+    await hass.data[DOMAIN][DATA_CONNECTION].async_close()
+
+    await hass.async_add_executor_job(hass.data[DOMAIN][DATA_CAPTURE].stop)
 
     hass.data.pop(DOMAIN)
 
@@ -112,7 +469,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 def _create_rfx(
-    config: Mapping[str, Any], event_callback: Callable[[rfxtrxmod.RFXtrxEvent], None]
+    config: Mapping[str, Any],
+    event_callback: Callable[[rfxtrxmod.RFXtrxEvent], None],
+    capture: FrameCapture | None = None,
 ) -> rfxtrxmod.Connect:
     """Construct a rfx object based on config."""
 
@@ -123,12 +482,18 @@ def _create_rfx(
     else:
         _LOGGER.debug("No modes defined, using device configuration")
 
-    if config[CONF_PORT] is not None:
+    if config.get(CONF_REPLAY_PATH) is not None:
+        # Play frames captured earlier instead of connecting to an RFXtrx
+        transport = ReplayTransport(config[CONF_REPLAY_PATH], config[CONF_REPLAY_SPEED])
+    elif config[CONF_PORT] is not None:
         # If port is set then we create a TCP connection
         transport = rfxtrxmod.PyNetworkTransport((config[CONF_HOST], config[CONF_PORT]))
     else:
         transport = rfxtrxmod.PySerialTransport(config[CONF_DEVICE])
 
+    if capture is not None:
+        transport = CaptureTransport(transport, capture)
+
     rfx = rfxtrxmod.Connect(
         transport,
         event_callback,
@@ -145,19 +510,119 @@ def _create_rfx(
     return rfx
 
 
-def _get_device_lookup(
-    devices: dict[str, dict[str, Any]],
-) -> dict[DeviceTuple, dict[str, Any]]:
-    """Get a lookup structure for devices."""
-    lookup = {}
+def get_parsed_devices(
+    hass: HomeAssistant, devices: Mapping[str, dict[str, Any]]
+) -> dict[str, ParsedDevice]:
+    """Return the configured devices by event code, parsing each packet once.
+
+    The parsed packets are cached while the integration is loaded, so the
+    platforms and the options flow share them. The cache is dropped
+    whenever the config entry or a device of it changes.
+    """
+    cache: dict[str, ParsedDevice | None]
+    if DOMAIN in hass.data:
+        cache = hass.data[DOMAIN].setdefault(DATA_PARSED_DEVICES, {})
+    else:
+        cache = {}
+
+    parsed = {}
     for event_code, event_config in devices.items():
-        if (event := get_rfx_object(event_code)) is None:
+        if event_code not in cache:
+            cache[event_code] = _parse_device(event_code, event_config)
+        if (parsed_device := cache[event_code]) is None:
             continue
-        device_id = get_device_id(
-            event.device, data_bits=event_config.get(CONF_DATA_BITS)
-        )
-        lookup[device_id] = event_config
-    return lookup
+
+        if parsed_device.config is not event_config:
+            if parsed_device.config.get(CONF_DATA_BITS) != event_config.get(
+                CONF_DATA_BITS
+            ):
+                parsed_device = _parse_device(event_code, event_config)
+            else:
+                parsed_device = parsed_device._replace(config=event_config)
+            cache[event_code] = parsed_device
+
+        if parsed_device is not None:
+            parsed[event_code] = parsed_device
+    return parsed
+
+
+def _parse_device(event_code: str, event_config: dict[str, Any]) -> ParsedDevice | None:
+    """Parse the packet of a configured device."""
+    if (event := get_rfx_object(event_code)) is None:
+        _LOGGER.error("Invalid device: %s", event_code)
+        return None
+    device_id = get_device_id(event.device, data_bits=event_config.get(CONF_DATA_BITS))
+    return ParsedDevice(event, device_id, event_config)
+
+
+def _get_device_lookup(
+    parsed_devices: Iterable[ParsedDevice],
+) -> tuple[dict[DeviceTuple, dict[str, Any]], dict[int, set[DeviceTuple]]]:
+    """Get lookup structures for devices and their Lighting4 data bits."""
+    lookup = {}
+    data_bits_lookup: dict[int, set[DeviceTuple]] = {}
+    for parsed_device in parsed_devices:
+        lookup[parsed_device.device_id] = parsed_device.config
+        _add_data_bits(data_bits_lookup, parsed_device.device_id, parsed_device.config)
+    return lookup, data_bits_lookup
+
+
+async def _async_get_classifier(hass: HomeAssistant) -> Classifier:
+    """Return a function listing the platforms which support an event."""
+    integration = await async_get_integration(hass, DOMAIN)
+    supported = {
+        platform: (await integration.async_get_platform(platform)).supported
+        for platform in PLATFORMS
+    }
+
+    def classify(event: rfxtrxmod.RFXtrxEvent) -> list[Platform]:
+        return [
+            platform
+            for platform, is_supported in supported.items()
+            if is_supported(event)
+        ]
+
+    return classify
+
+
+def _classify_devices(
+    parsed_devices: Iterable[ParsedDevice], classify: Classifier
+) -> dict[Platform, list[ParsedDevice]]:
+    """Sort the devices into the platforms supporting them."""
+    platform_devices: dict[Platform, list[ParsedDevice]] = {
+        platform: [] for platform in PLATFORMS
+    }
+    for parsed_device in parsed_devices:
+        for platform in classify(parsed_device.event):
+            platform_devices[platform].append(parsed_device)
+    return platform_devices
+
+
+def _add_data_bits(
+    data_bits_lookup: dict[int, set[DeviceTuple]],
+    device_id: DeviceTuple,
+    event_config: Mapping[str, Any],
+) -> None:
+    """Index the masked id of a Lighting4 device by its data bits."""
+    if (data_bits := event_config.get(CONF_DATA_BITS)) and int(
+        device_id.packettype, 16
+    ) == DEVICE_PACKET_TYPE_LIGHTING4:
+        data_bits_lookup.setdefault(data_bits, set()).add(device_id)
+
+
+def _remove_data_bits(
+    data_bits_lookup: dict[int, set[DeviceTuple]],
+    device_id: DeviceTuple,
+    event_config: Mapping[str, Any],
+) -> None:
+    """Remove a Lighting4 device from the data bits index."""
+    if (data_bits := event_config.get(CONF_DATA_BITS)) is None or (
+        device_ids := data_bits_lookup.get(data_bits)
+    ) is None:
+        return
+    device_ids.discard(device_id)
+    if not device_ids:
+        del data_bits_lookup[data_bits]
 
 
 async def async_setup_internal(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -165,61 +630,106 @@ async def async_setup_internal(hass: HomeAssistant, entry: ConfigEntry) -> None:
     config = entry.data
 
     # Setup some per device config
-    devices = _get_device_lookup(config[CONF_DEVICES])
-    pt2262_devices: set[str] = set()
+    parsed_devices = get_parsed_devices(hass, config[CONF_DEVICES]).values()
+    devices, data_bits_lookup = _get_device_lookup(parsed_devices)
+    classify = await _async_get_classifier(hass)
+    platform_devices = _classify_devices(parsed_devices, classify)
+    hass.data[DOMAIN][DATA_PLATFORM_DEVICES] = platform_devices
+
+    # Platforms handed each device, and the kinds of frame classified for it.
+    # A later kind of frame, e.g. a security panic, may add platforms.
+    device_platforms: dict[DeviceTuple, set[Platform]] = {}
+    for platform, platform_parsed_devices in platform_devices.items():
+        for parsed_device in platform_parsed_devices:
+            device_platforms.setdefault(parsed_device.device_id, set()).add(platform)
+    classified_frames: set[tuple[DeviceTuple, type, Any]] = set()
+    pt2262_devices = PT2262DeviceIds()
+    suppressed_event_types = set(config.get(CONF_SUPPRESSED_EVENT_TYPES) or [])
+
+    metrics = ReceiveMetrics()
+    hass.data[DOMAIN][DATA_RECEIVE_METRICS] = metrics
+
+    router = RfxtrxEventRouter(metrics)
+    hass.data[DOMAIN][DATA_EVENT_ROUTER] = router
+
+    deduplicator = FrameDeduplicator(config.get(CONF_DEDUPE_WINDOW, 0) / 1000)
+    hass.data[DOMAIN][DATA_DEDUPLICATOR] = deduplicator
 
     device_registry = dr.async_get(hass)
+    registry_ids: dict[DeviceTuple, str] = {}
+
+    # Automatically added devices waiting to be saved in the config entry
+    pending_devices: dict[str, dict[str, Any]] = {}
+    cancel_save_devices: CALLBACK_TYPE | None = None
 
     # Declare the Handle event
     @callback
-    def async_handle_receive(event: rfxtrxmod.RFXtrxEvent) -> None:
+    def async_handle_receive(event: rfxtrxmod.RFXtrxEvent, received: float) -> None:
         """Handle received messages from RFXtrx gateway."""
 
-        if isinstance(event, rfxtrxmod.ConnectionLost):
-            _LOGGER.warning("Connection was lost, triggering reload")
-            hass.async_create_task(
-                hass.config_entries.async_reload(entry.entry_id),
-                f"config entry reload {entry.title} {entry.domain} {entry.entry_id}",
-            )
+        if isinstance(event, rfxtrxmod.ConnectionEvent):
+            if isinstance(event, rfxtrxmod.ConnectionLost):
+                _LOGGER.warning("Connection was lost, reconnecting")
+                connection.async_connect()
             return
 
+        start = time.monotonic()
+        metrics.frames += 1
+        metrics.handoff.record(start - received)
+
         if not event.device or not event.device.id_string:
+            metrics.dropped += 1
             return
 
-        event_data = {
-            "packet_type": event.device.packettype,
-            "sub_type": event.device.subtype,
-            "type_string": event.device.type_string,
-            "id_string": event.device.id_string,
-            "data": binascii.hexlify(event.data).decode("ASCII"),
-            "values": getattr(event, "values", None),
-        }
+        if deduplicator.async_is_duplicate(event.data, start):
+            metrics.deduplicated += 1
+            return
 
-        _LOGGER.debug("Receive RFXCOM event: %s", event_data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Receive RFXCOM event: %s", _get_event_data(event))
 
-        data_bits = get_device_data_bits(event.device, devices)
+        data_bits = get_device_data_bits(event.device, data_bits_lookup)
         device_id = get_device_id(event.device, data_bits=data_bits)
 
         if device_id not in devices:
             if config[CONF_AUTOMATIC_ADD]:
                 _add_device(event, device_id)
             else:
+                metrics.unknown_device += 1
                 return
 
         if event.device.packettype == DEVICE_PACKET_TYPE_LIGHTING4:
             find_possible_pt2262_device(pt2262_devices, event.device.id_string)
             pt2262_devices.add(event.device.id_string)
 
-        device_entry = device_registry.async_get_device(
-            identifiers={(DOMAIN, *device_id)},  # type: ignore[arg-type]
-        )
-        if device_entry:
-            event_data[ATTR_DEVICE_ID] = device_entry.id
-
-        # Callback to HA registered components.
-        async_dispatcher_send(hass, SIGNAL_EVENT, event, device_id)
+        # Callback to the entities of the device and its group.
+        metrics.dispatch.record(time.monotonic() - start)
+        router.async_route(event, device_id)
+        metrics.total.record(time.monotonic() - received)
+
+        # Hand the device to platforms supporting a kind of frame not seen before.
+        if (
+            config[CONF_AUTOMATIC_ADD]
+            and (frame_kind := (device_id, type(event), _get_sensor_status(event)))
+            not in classified_frames
+        ):
+            classified_frames.add(frame_kind)
+            known_platforms = device_platforms.setdefault(device_id, set())
+            for platform in classify(event):
+                if platform not in known_platforms:
+                    known_platforms.add(platform)
+                    async_dispatcher_send(
+                        hass, f"{SIGNAL_EVENT}_{platform}", event, device_id
+                    )
 
         # Signal event to any other listeners
+        if device_id.packettype in suppressed_event_types:
+            return
+
+        event_data = _get_event_data(event)
+        if registry_id := registry_ids.get(device_id):
+            event_data[ATTR_DEVICE_ID] = registry_id
+
         hass.bus.async_fire(EVENT_RFXTRX_EVENT, event_data)
 
     @callback
@@ -236,15 +746,40 @@ async def async_setup_internal(hass: HomeAssistant, entry: ConfigEntry) -> None:
             "".join(f"{x:02x}" for x in event.data),
         )
 
-        data = entry.data.copy()
-        data[CONF_DEVICES] = copy.deepcopy(entry.data[CONF_DEVICES])
         event_code = binascii.hexlify(event.data).decode("ASCII")
-        data[CONF_DEVICES][event_code] = config
-        hass.config_entries.async_update_entry(entry=entry, data=data)
+        pending_devices[event_code] = config
         devices[device_id] = config
+        _add_data_bits(data_bits_lookup, device_id, config)
+
+        nonlocal cancel_save_devices
+        if cancel_save_devices is None:
+            cancel_save_devices = async_call_later(
+                hass, SAVE_DEVICES_DELAY, _async_save_devices
+            )
+
+    @callback
+    def _async_save_devices(*_: Any) -> None:
+        """Store the devices added since the last save in the config entry."""
+        nonlocal cancel_save_devices
+        if cancel_save_devices is not None:
+            cancel_save_devices()
+            cancel_save_devices = None
+        if not pending_devices:
+            return
+
+        _LOGGER.debug("Saving %s added devices", len(pending_devices))
+        data = {
+            **entry.data,
+            CONF_DEVICES: {**entry.data[CONF_DEVICES], **pending_devices},
+        }
+        pending_devices.clear()
+        hass.config_entries.async_update_entry(entry=entry, data=data)
 
     @callback
     def _remove_device(device_id: DeviceTuple) -> None:
+        for event_code, event_config in list(pending_devices.items()):
+            if tuple(event_config[CONF_DEVICE_ID]) == device_id:
+                del pending_devices[event_code]
         data = {
             **entry.data,
             CONF_DEVICES: {
@@ -254,50 +789,135 @@ async def async_setup_internal(hass: HomeAssistant, entry: ConfigEntry) -> None:
             },
         }
         hass.config_entries.async_update_entry(entry=entry, data=data)
-        devices.pop(device_id)
+        if (event_config := devices.pop(device_id, None)) is not None:
+            _remove_data_bits(data_bits_lookup, device_id, event_config)
+        _clear_parsed_devices()
+
+    @callback
+    def _clear_parsed_devices() -> None:
+        hass.data[DOMAIN].pop(DATA_PARSED_DEVICES, None)
+
+    async def _async_entry_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Drop the parsed devices as the configured devices may have changed."""
+        _clear_parsed_devices()
 
     @callback
     def _updated_device(event: Event) -> None:
         if event.data["action"] != "remove":
+            if (
+                device_entry := device_registry.async_get(event.data["device_id"])
+            ) is not None and entry.entry_id in device_entry.config_entries:
+                _map_device_entry(device_entry)
             return
         device_entry = device_registry.deleted_devices[event.data["device_id"]]
         if entry.entry_id not in device_entry.config_entries:
             return
         device_id = get_device_tuple_from_identifiers(device_entry.identifiers)
         if device_id:
+            registry_ids.pop(device_id, None)
             _remove_device(device_id)
 
-    # Initialize library
-    rfx_object = await hass.async_add_executor_job(
-        _create_rfx, config, lambda event: hass.add_job(async_handle_receive, event)
+    @callback
+    def _map_device_entry(device_entry: dr.DeviceEntry) -> None:
+        if device_id := get_device_tuple_from_identifiers(device_entry.identifiers):
+            registry_ids[device_id] = device_entry.id
+
+    for device_entry in dr.async_entries_for_config_entry(
+        device_registry, entry.entry_id
+    ):
+        _map_device_entry(device_entry)
+
+    receive_queue = RfxtrxReceiveQueue(hass, async_handle_receive)
+    hass.data[DOMAIN][DATA_RECEIVE_QUEUE] = receive_queue
+
+    transmitter = RfxtrxTransmitter(
+        hass,
+        lambda: connection.transport,
+        gap=config.get(CONF_TRANSMIT_GAP, 0) / 1000,
     )
+    transmitter.async_start()
+    hass.data[DOMAIN][DATA_TRANSMITTER] = transmitter
 
-    hass.data[DOMAIN][DATA_RFXOBJECT] = rfx_object
+    capture = FrameCapture(hass.config.path(CAPTURE_FILENAME))
+    hass.data[DOMAIN][DATA_CAPTURE] = capture
+
+    # Initialize library in the background, commands are held until connected
+    connection = RfxtrxConnection(hass, entry, receive_queue.put, transmitter, capture)
+    hass.data[DOMAIN][DATA_CONNECTION] = connection
+    try:
+        await connection.async_start()
+    except ConfigEntryNotReady:
+        await transmitter.async_stop()
+        raise
+
+    async def _async_stop_transmitter(event: Event) -> None:
+        """Stop the transmit worker."""
+        await transmitter.async_stop()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop_transmitter)
+    )
 
     entry.async_on_unload(
         hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, _updated_device)
     )
+    entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
 
-    def _shutdown_rfxtrx(event: Event) -> None:
+    entry.async_on_unload(_async_save_devices)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save_devices)
+    )
+
+    async def _async_shutdown_rfxtrx(event: Event) -> None:
         """Close connection with RFXtrx."""
-        rfx_object.close_connection()
+        await connection.async_close()
+        await hass.async_add_executor_job(capture.stop)
 
     entry.async_on_unload(
-        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _shutdown_rfxtrx)
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown_rfxtrx)
     )
 
-    def send(call: ServiceCall) -> None:
+    async def send(call: ServiceCall) -> None:
         event = call.data[ATTR_EVENT]
-        rfx_object.transport.send(event)
+        await transmitter.async_send(send_raw, event, priority=TransmitPriority.BULK)
 
     hass.services.async_register(DOMAIN, SERVICE_SEND, send, schema=SERVICE_SEND_SCHEMA)
 
+    async def set_capture(call: ServiceCall) -> None:
+        if call.data[ATTR_ENABLED]:
+            await hass.async_add_executor_job(capture.start, call.data[ATTR_COMPRESS])
+        else:
+            await hass.async_add_executor_job(capture.stop)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_CAPTURE, set_capture, schema=SERVICE_CAPTURE_SCHEMA
+    )
+
+
+def _get_sensor_status(event: rfxtrxmod.RFXtrxEvent) -> Any:
+    """Return the sensor status of an event, which some platforms depend on."""
+    if isinstance(event, rfxtrxmod.SensorEvent):
+        return event.values.get("Sensor Status")
+    return None
+
+
+def _get_event_data(event: rfxtrxmod.RFXtrxEvent) -> dict[str, Any]:
+    """Return the bus event payload for a received event."""
+    return {
+        "packet_type": event.device.packettype,
+        "sub_type": event.device.subtype,
+        "type_string": event.device.type_string,
+        "id_string": event.device.id_string,
+        "data": binascii.hexlify(event.data).decode("ASCII"),
+        "values": getattr(event, "values", None),
+    }
+
 
 async def async_setup_platform_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    supported: Callable[[rfxtrxmod.RFXtrxEvent], bool],
+    platform: Platform,
     constructor: Callable[
         [
             rfxtrxmod.RFXtrxEvent,
@@ -314,16 +934,9 @@ async def async_setup_platform_entry(
 
     # Add entities from config
     entities = []
-    for packet_id, entity_info in entry_data[CONF_DEVICES].items():
-        if (event := get_rfx_object(packet_id)) is None:
-            _LOGGER.error("Invalid device: %s", packet_id)
-            continue
-        if not supported(event):
-            continue
-
-        device_id = get_device_id(
-            event.device, data_bits=entity_info.get(CONF_DATA_BITS)
-        )
+    for event, device_id, entity_info in hass.data[DOMAIN][DATA_PLATFORM_DEVICES][
+        platform
+    ]:
         if device_id in device_ids:
             continue
         device_ids.add(device_id)
@@ -337,17 +950,14 @@ async def async_setup_platform_entry(
 
         @callback
         def _update(event: rfxtrxmod.RFXtrxEvent, device_id: DeviceTuple) -> None:
-            """Handle light updates from the RFXtrx gateway."""
-            if not supported(event):
-                return
-
+            """Handle devices added by the RFXtrx gateway."""
             if device_id in device_ids:
                 return
             device_ids.add(device_id)
             async_add_entities(constructor(event, event, device_id, {}))
 
         config_entry.async_on_unload(
-            async_dispatcher_connect(hass, SIGNAL_EVENT, _update)
+            async_dispatcher_connect(hass, f"{SIGNAL_EVENT}_{platform}", _update)
         )
 
 
@@ -389,46 +999,102 @@ def get_pt2262_cmd(device_id: str, data_bits: int) -> str | None:
 
 
 def get_device_data_bits(
-    device: rfxtrxmod.RFXtrxDevice, devices: dict[DeviceTuple, dict[str, Any]]
+    device: rfxtrxmod.RFXtrxDevice,
+    data_bits_lookup: Mapping[int, Collection[DeviceTuple]],
 ) -> int | None:
-    """Deduce data bits for device based on a cache of device bits."""
-    data_bits = None
+    """Deduce data bits for device based on an index of device bits.
+
+    The index maps each configured number of data bits to the masked ids of
+    the devices using it, so the cost depends on the number of distinct data
+    bits in use and not on the number of configured devices.
+    """
     if device.packettype == DEVICE_PACKET_TYPE_LIGHTING4:
-        for device_id, entity_config in devices.items():
-            bits = entity_config.get(CONF_DATA_BITS)
-            if get_device_id(device, bits) == device_id:
-                data_bits = bits
-                break
-    return data_bits
+        for bits, device_ids in data_bits_lookup.items():
+            if get_device_id(device, bits) in device_ids:
+                return bits
+    return None
+
+
+class PT2262DeviceIds:
+    """Bounded store of seen Lighting4/PT2262 ids.
+
+    The least recently seen ids are evicted once the store is full. Ids are
+    bucketed by length and first character, which are the only ids that can
+    share an address prefix with a new id.
+    """
+
+    def __init__(self, max_size: int = PT2262_MAX_DEVICE_IDS) -> None:
+        """Initialize the store."""
+        self._max_size = max_size
+        self._device_ids: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._buckets: dict[tuple[int, str], dict[str, None]] = {}
+
+    def __contains__(self, device_id: object) -> bool:
+        """Return if an id is in the store."""
+        return device_id in self._device_ids
+
+    def __len__(self) -> int:
+        """Return the number of stored ids."""
+        return len(self._device_ids)
+
+    def add(self, device_id: str) -> None:
+        """Add an id, evicting the least recently seen one when full."""
+        if device_id in self._device_ids:
+            self._device_ids.move_to_end(device_id)
+            return
 
+        key = (len(device_id), device_id[:1])
+        self._device_ids[device_id] = key
+        self._buckets.setdefault(key, {})[device_id] = None
 
-def find_possible_pt2262_device(device_ids: set[str], device_id: str) -> str | None:
+        if len(self._device_ids) > self._max_size:
+            old_id, old_key = self._device_ids.popitem(last=False)
+            bucket = self._buckets[old_key]
+            del bucket[old_id]
+            if not bucket:
+                del self._buckets[old_key]
+
+    def candidates(self, device_id: str) -> Iterable[str]:
+        """Return the stored ids which may share a prefix with an id."""
+        return self._buckets.get((len(device_id), device_id[:1]), {})
+
+
+def find_possible_pt2262_device(
+    device_ids: PT2262DeviceIds, device_id: str
+) -> str | None:
     """Look for the device which id matches the given device_id parameter."""
-    for dev_id in device_ids:
-        if len(dev_id) == len(device_id):
-            size = None
-            for i, (char1, char2) in enumerate(zip(dev_id, device_id)):
-                if char1 != char2:
-                    break
-                size = i
-            if size is not None:
-                size = len(dev_id) - size - 1
-                _LOGGER.info(
-                    (
-                        "Found possible device %s for %s "
-                        "with the following configuration:\n"
-                        "data_bits=%d\n"
-                        "command_on=0x%s\n"
-                        "command_off=0x%s\n"
-                    ),
-                    device_id,
-                    dev_id,
-                    size * 4,
-                    dev_id[-size:],
-                    device_id[-size:],
-                )
-                return dev_id
-    return None
+    best_id = None
+    best_size = -1
+    for dev_id in device_ids.candidates(device_id):
+        if dev_id == device_id:
+            continue
+        size = 0
+        for char1, char2 in zip(dev_id, device_id):
+            if char1 != char2:
+                break
+            size += 1
+        if size > best_size:
+            best_id, best_size = dev_id, size
+
+    if best_id is None:
+        return None
+
+    size = len(best_id) - best_size
+    _LOGGER.info(
+        (
+            "Found possible device %s for %s "
+            "with the following configuration:\n"
+            "data_bits=%d\n"
+            "command_on=0x%s\n"
+            "command_off=0x%s\n"
+        ),
+        device_id,
+        best_id,
+        size * 4,
+        best_id[-size:],
+        device_id[-size:],
+    )
+    return best_id
 
 
 def get_device_id(
@@ -446,6 +1112,18 @@ def get_device_id(
     return DeviceTuple(f"{device.packettype:x}", f"{device.subtype:x}", id_string)
 
 
+def get_group_id(event: rfxtrxmod.RFXtrxEvent) -> str | None:
+    """Return the group id targeted by a group command event."""
+    if (
+        isinstance(event, rfxtrxmod.ControlEvent)
+        and event.values.get("Command") in COMMAND_GROUP_LIST
+    ):
+        # If id_string is 213c7f2:1, the group_id is 213c7f2
+        (group_id, _, _) = cast(str, event.device.id_string).partition(":")
+        return group_id
+    return None
+
+
 def get_device_tuple_from_identifiers(
     identifiers: set[tuple[str, str]],
 ) -> DeviceTuple | None:
@@ -487,6 +1165,7 @@ class RfxtrxEntity(RestoreEntity):
     _attr_should_poll = False
     _device: rfxtrxmod.RFXtrxDevice
     _event: rfxtrxmod.RFXtrxEvent | None
+    _receive_metrics: ReceiveMetrics | None = None
 
     def __init__(
         self,
@@ -513,10 +1192,22 @@ class RfxtrxEntity(RestoreEntity):
         if self._event:
             self._apply_event(self._event)
 
+        self._receive_metrics = self.hass.data[DOMAIN][DATA_RECEIVE_METRICS]
+        router: RfxtrxEventRouter = self.hass.data[DOMAIN][DATA_EVENT_ROUTER]
         self.async_on_remove(
-            async_dispatcher_connect(self.hass, SIGNAL_EVENT, self._handle_event)
+            router.async_register(self._device_id, self._group_id, self._handle_event)
         )
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, recording how long it took if a frame caused it."""
+        if self._receive_metrics is None or not self._receive_metrics.receiving:
+            super().async_write_ha_state()
+            return
+        start = time.monotonic()
+        super().async_write_ha_state()
+        self._receive_metrics.state_write.record(time.monotonic() - start)
+
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the device state attributes."""
@@ -528,14 +1219,8 @@ class RfxtrxEntity(RestoreEntity):
         self, event: rfxtrxmod.RFXtrxEvent, device_id: DeviceTuple
     ) -> bool:
         """Check if event applies to me."""
-        if isinstance(event, rfxtrxmod.ControlEvent):
-            if (
-                "Command" in event.values
-                and event.values["Command"] in COMMAND_GROUP_LIST
-            ):
-                device: rfxtrxmod.RFXtrxDevice = event.device
-                (group_id, _, _) = cast(str, device.id_string).partition(":")
-                return group_id == self._group_id
+        if (group_id := get_group_id(event)) is not None:
+            return group_id == self._group_id
 
         # Otherwise, the event only applies to the matching device.
         return device_id == self._device_id
@@ -558,6 +1243,7 @@ class RfxtrxCommandEntity(RfxtrxEntity):
     """
 
     _attr_name = None
+    _transmit_priority = TransmitPriority.NORMAL
 
     def __init__(
         self,
@@ -570,6 +1256,85 @@ class RfxtrxCommandEntity(RfxtrxEntity):
 
     async def _async_send(
         self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts
+    ) -> TransmitTiming:
+        return await self._async_transmit(fun, args)
+
+    async def _async_send_at(
+        self,
+        deadline: float,
+        fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None],
+        *args: *_Ts,
+    ) -> TransmitTiming:
+        """Send a command as close as possible to a monotonic time."""
+        return await asyncio.shield(await self._async_queue_at(deadline, fun, *args))
+
+    async def _async_queue_at(
+        self,
+        deadline: float,
+        fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None],
+        *args: *_Ts,
+    ) -> asyncio.Task[TransmitTiming]:
+        """Queue a command to be sent as close as possible to a monotonic time.
+
+        Returns once the command is with the transmitter, with a task
+        ending when it has been written. If cancelled before then, the
+        command is not sent.
+        """
+        if (delay := deadline - time.monotonic() - TIMED_SEND_LEAD) > 0:
+            await asyncio.sleep(delay)
+        return self._async_queue(fun, args, not_before=deadline)
+
+    async def _async_transmit(
+        self,
+        fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None],
+        args: tuple[*_Ts],
+    ) -> TransmitTiming:
+        """Queue a command for the transmitter and wait until it is written."""
+        return await asyncio.shield(self._async_queue(fun, args))
+
+    @callback
+    def _async_queue(
+        self,
+        fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None],
+        args: tuple[*_Ts],
+        not_before: float | None = None,
+    ) -> asyncio.Task[TransmitTiming]:
+        """Queue a command for the transmitter.
+
+        A queued command is written even if the caller is cancelled, so an
+        entity never has to guess whether a device received it.
+        """
+        transmitter: RfxtrxTransmitter = self.hass.data[DOMAIN][DATA_TRANSMITTER]
+        if getattr(fun, "__name__", None) in URGENT_COMMANDS:
+            priority = TransmitPriority.URGENT
+        else:
+            priority = self._transmit_priority
+        return self.hass.async_create_task(
+            transmitter.async_send(
+                fun,
+                *args,
+                priority=priority,
+                source=self.entity_id,
+                not_before=not_before,
+            )
+        )
+
+    @callback
+    def _async_request_metrics(self) -> RequestMetrics:
+        """Return the metrics of the movement requests to this entity."""
+        transmitter: RfxtrxTransmitter = self.hass.data[DOMAIN][DATA_TRANSMITTER]
+        return transmitter.async_request_metrics(self.entity_id)
+
+    @callback
+    def _async_record_pulse(
+        self,
+        name: str,
+        configured: float,
+        start: TransmitTiming,
+        end: TransmitTiming,
     ) -> None:
-        rfx_object: rfxtrxmod.Connect = self.hass.data[DOMAIN][DATA_RFXOBJECT]
-        await self.hass.async_add_executor_job(fun, rfx_object.transport, *args)
+        """Record the time between two commands against the configured time."""
+        transmitter: RfxtrxTransmitter = self.hass.data[DOMAIN][DATA_TRANSMITTER]
+        transmitter.async_record_pulse(
+            self.entity_id, name, configured, end.written - start.written
+        )
@@ -12,7 +12,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_COMMAND_OFF, CONF_COMMAND_ON, STATE_ON
+from homeassistant.const import CONF_COMMAND_OFF, CONF_COMMAND_ON, STATE_ON, Platform
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import event as evt
 from homeassistant.helpers.entity import Entity
@@ -118,7 +118,7 @@ async def async_setup_entry(
         ]
 
     await async_setup_platform_entry(
-        hass, config_entry, async_add_entities, supported, _constructor
+        hass, config_entry, async_add_entities, Platform.BINARY_SENSOR, _constructor
     )
 
 
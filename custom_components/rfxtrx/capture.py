@@ -0,0 +1,248 @@
+"""Capture of raw RFXtrx frames to a rotating binary log."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from enum import IntEnum
+import gzip
+import logging
+import os
+import struct
+import threading
+import time
+from typing import IO, Any, NamedTuple
+
+import RFXtrx as rfxtrxmod
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FILENAME = "rfxtrx_capture.bin"
+
+# Every capture file starts with this header
+CAPTURE_MAGIC = b"RFXCAP\x00\x01"
+
+# Monotonic time in seconds, direction and length of the frame following it
+RECORD_HEADER = struct.Struct("<dBH")
+
+CAPTURE_MAX_BYTES = 10 * 1024 * 1024
+CAPTURE_BACKUP_COUNT = 5
+CAPTURE_FLUSH_INTERVAL = 1.0
+CAPTURE_FLUSH_RECORDS = 256
+
+
+class Direction(IntEnum):
+    """Direction of a captured frame."""
+
+    RECEIVED = 0
+    TRANSMITTED = 1
+
+
+class CapturedFrame(NamedTuple):
+    """A frame read back from a capture file."""
+
+    timestamp: float
+    direction: Direction
+    data: bytes
+
+
+class FrameCapture:
+    """Append raw frames to a binary log from a background writer.
+
+    Frames are recorded from the reader and transmit threads into a
+    buffer, which a writer thread flushes in bulk. A record is the record
+    header followed by the frame. The log is rotated once it holds the
+    maximum number of bytes, keeping a number of backups, and may be gzip
+    compressed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        backup_count: int = CAPTURE_BACKUP_COUNT,
+    ) -> None:
+        """Initialize an inactive capture writing to a path."""
+        self._base_path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._compress = False
+        self._condition = threading.Condition()
+        self._buffer: list[bytes] = []
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        self._file: IO[bytes] | None = None
+        self._size = 0
+        self.active = False
+        self.frames = 0
+        self.bytes = 0
+        self.rotations = 0
+
+    @property
+    def path(self) -> str:
+        """Return the path of the current log."""
+        return f"{self._base_path}.gz" if self._compress else self._base_path
+
+    def start(self, compress: bool = False) -> None:
+        """Start capturing, appending to an existing log.
+
+        A running capture with a different compress setting is stopped and
+        restarted on the log for the new setting.
+        """
+        if self.active:
+            if compress == self._compress:
+                return
+            self.stop()
+        self._compress = compress
+        self._open()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._write_loop, name="rfxtrx_capture", daemon=True
+        )
+        self._thread.start()
+        self.active = True
+        _LOGGER.info("Capturing RFXtrx frames to %s", self.path)
+
+    def stop(self) -> None:
+        """Stop capturing after writing the buffered frames."""
+        if not self.active:
+            return
+        self.active = False
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        _LOGGER.info("Stopped capturing RFXtrx frames")
+
+    def record(self, direction: Direction, data: bytes | bytearray) -> None:
+        """Buffer a frame, called from any thread."""
+        if not self.active:
+            return
+        record = RECORD_HEADER.pack(time.monotonic(), direction, len(data)) + data
+        with self._condition:
+            self._buffer.append(record)
+            if len(self._buffer) >= CAPTURE_FLUSH_RECORDS:
+                self._condition.notify()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the capture statistics."""
+        return {
+            "active": self.active,
+            "path": self.path,
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "rotations": self.rotations,
+        }
+
+    def _write_loop(self) -> None:
+        """Write buffered frames until stopped."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping
+                    or len(self._buffer) >= CAPTURE_FLUSH_RECORDS,
+                    CAPTURE_FLUSH_INTERVAL,
+                )
+                records, self._buffer = self._buffer, []
+                stopping = self._stopping
+            try:
+                self._write(records)
+            except OSError as err:
+                _LOGGER.error("Unable to write RFXtrx capture: %s", err)
+            if stopping:
+                return
+
+    def _write(self, records: list[bytes]) -> None:
+        """Write records to the log, rotating it when full."""
+        assert self._file is not None
+        for record in records:
+            if self._size + len(record) > self._max_bytes:
+                self._rotate()
+            self._file.write(record)
+            self._size += len(record)
+            self.frames += 1
+            self.bytes += len(record)
+        self._file.flush()
+
+    def _open(self) -> None:
+        """Open the log, writing the header to a new one."""
+        path = self.path
+        # A compressed log reopened after a restart is counted at its
+        # compressed size, so it may hold somewhat more before rotating
+        self._size = os.path.getsize(path) if os.path.exists(path) else 0
+        if self._compress:
+            self._file = gzip.open(path, "ab")
+        else:
+            self._file = open(path, "ab")  # pylint: disable=consider-using-with
+        if self._size == 0:
+            self._file.write(CAPTURE_MAGIC)
+            self._size = len(CAPTURE_MAGIC)
+
+    def _rotate(self) -> None:
+        """Move the log to the first backup and start a new one."""
+        assert self._file is not None
+        self._file.close()
+        path = self.path
+        for index in range(self._backup_count - 1, 0, -1):
+            if os.path.exists(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        if self._backup_count:
+            os.replace(path, f"{path}.1")
+        else:
+            os.remove(path)
+        self.rotations += 1
+        self._open()
+
+
+def read_capture(path: str) -> Iterator[CapturedFrame]:
+    """Read the frames of a capture file, compressed or not."""
+    with open(path, "rb") as raw:
+        compressed = raw.read(2) == b"\x1f\x8b"
+    with gzip.open(path, "rb") if compressed else open(path, "rb") as file:
+        if file.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not an RFXtrx capture")
+        while len(header := file.read(RECORD_HEADER.size)) == RECORD_HEADER.size:
+            timestamp, direction, length = RECORD_HEADER.unpack(header)
+            if len(data := file.read(length)) < length:
+                # Truncated by a crash while writing
+                return
+            yield CapturedFrame(timestamp, Direction(direction), data)
+
+
+class CaptureTransport(rfxtrxmod.RFXtrxTransport):
+    """Transport recording the frames passing through another transport."""
+
+    def __init__(
+        self, transport: rfxtrxmod.RFXtrxTransport, capture: FrameCapture
+    ) -> None:
+        """Initialize the transport."""
+        self.transport = transport
+        self.capture = capture
+
+    def connect(self, timeout: float | None = None) -> None:
+        """Connect the transport."""
+        self.transport.connect(timeout)
+
+    def reset(self) -> None:
+        """Reset the RFXtrx."""
+        self.transport.reset()
+
+    def close(self) -> None:
+        """Close the transport."""
+        self.transport.close()
+
+    def receive_blocking(self) -> rfxtrxmod.RFXtrxEvent | None:
+        """Receive and record a frame."""
+        event = self.transport.receive_blocking()
+        if event is not None and self.capture.active:
+            self.capture.record(Direction.RECEIVED, event.data)
+        return event
+
+    def send(self, data: bytes | bytearray) -> None:
+        """Record and send a frame."""
+        if self.capture.active:
+            self.capture.record(Direction.TRANSMITTED, data)
+        self.transport.send(data)
@@ -38,26 +38,38 @@ from . import (
     DeviceTuple,
     get_device_id,
     get_device_tuple_from_identifiers,
+    get_parsed_devices,
     get_rfx_object,
 )
 from .binary_sensor import supported as binary_supported
+from .capture import CAPTURE_FILENAME
 from .const import (
     CONF_AUTOMATIC_ADD,
     CONF_DATA_BITS,
+    CONF_DEDUPE_WINDOW,
     CONF_OFF_DELAY,
     CONF_PROTOCOLS,
     CONF_REPLACE_DEVICE,
+    CONF_REPLAY_PATH,
+    CONF_REPLAY_SPEED,
+    CONF_SUPPRESSED_EVENT_TYPES,
+    CONF_TRANSMIT_GAP,
     CONF_VENETIAN_BLIND_MODE,
     CONST_VENETIAN_BLIND_MODE_DEFAULT,
     CONST_VENETIAN_BLIND_MODE_EU,
     CONST_VENETIAN_BLIND_MODE_US,
     DEVICE_PACKET_TYPE_LIGHTING4,
 )
+from .replay import ReplayTransport
 
 CONF_EVENT_CODE = "event_code"
 CONF_MANUAL_PATH = "Enter Manually"
 
 RECV_MODES = sorted(itertools.chain(*rfxtrxmod.lowlevel.Status.RECMODES))
+EVENT_TYPES = {
+    f"{packettype:x}": packet.__name__
+    for packettype, packet in rfxtrxmod.lowlevel.PACKET_TYPES.items()
+}
 
 ##############################
 from .ext import config_flow as ext_config_flow
@@ -108,6 +120,10 @@ class OptionsFlow(config_entries.OptionsFlow):
             self._global_options = {
                 CONF_AUTOMATIC_ADD: user_input[CONF_AUTOMATIC_ADD],
                 CONF_PROTOCOLS: user_input[CONF_PROTOCOLS] or None,
+                CONF_SUPPRESSED_EVENT_TYPES: user_input[CONF_SUPPRESSED_EVENT_TYPES]
+                or None,
+                CONF_DEDUPE_WINDOW: user_input[CONF_DEDUPE_WINDOW],
+                CONF_TRANSMIT_GAP: user_input[CONF_TRANSMIT_GAP],
             }
             if CONF_DEVICE in user_input:
                 entry_id = user_input[CONF_DEVICE]
@@ -164,6 +180,19 @@ class OptionsFlow(config_entries.OptionsFlow):
                 CONF_PROTOCOLS,
                 default=self._config_entry.data.get(CONF_PROTOCOLS) or [],
             ): cv.multi_select(RECV_MODES),
+            vol.Optional(
+                CONF_SUPPRESSED_EVENT_TYPES,
+                default=self._config_entry.data.get(CONF_SUPPRESSED_EVENT_TYPES)
+                or [],
+            ): cv.multi_select(EVENT_TYPES),
+            vol.Optional(
+                CONF_DEDUPE_WINDOW,
+                default=self._config_entry.data.get(CONF_DEDUPE_WINDOW, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_TRANSMIT_GAP,
+                default=self._config_entry.data.get(CONF_TRANSMIT_GAP, 0),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
             vol.Optional(CONF_EVENT_CODE): str,
             vol.Optional(CONF_DEVICE): vol.In(configure_devices),
         }
@@ -436,12 +465,10 @@ class OptionsFlow(config_entries.OptionsFlow):
     def _can_add_device(self, new_rfx_obj: rfxtrxmod.RFXtrxEvent) -> bool:
         """Check if device does not already exist."""
         new_device_id = get_device_id(new_rfx_obj.device)
-        for packet_id, entity_info in self._config_entry.data[CONF_DEVICES].items():
-            rfx_obj = get_rfx_object(packet_id)
-            assert rfx_obj
-
-            device_id = get_device_id(rfx_obj.device, entity_info.get(CONF_DATA_BITS))
-            if new_device_id == device_id:
+        for parsed_device in get_parsed_devices(
+            self.hass, self._config_entry.data[CONF_DEVICES]
+        ).values():
+            if new_device_id == parsed_device.device_id:
                 return False
 
         return True
@@ -525,9 +552,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if user_input[CONF_TYPE] == "Serial":
                 return await self.async_step_setup_serial()
 
+            if user_input[CONF_TYPE] == "Replay":
+                return await self.async_step_setup_replay()
+
             return await self.async_step_setup_network()
 
-        list_of_types = ["Serial", "Network"]
+        list_of_types = ["Serial", "Network", "Replay"]
 
         schema = vol.Schema({vol.Required(CONF_TYPE): vol.In(list_of_types)})
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
@@ -621,15 +651,49 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_setup_replay(
+        self, user_input: dict[str, Any] | None = None
+    ) -> data_entry_flow.FlowResult:
+        """Step when setting up replay of a capture file."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            path = self.hass.config.path(user_input[CONF_REPLAY_PATH])
+            try:
+                data = await self.async_validate_rfx(
+                    replay_path=path, replay_speed=user_input[CONF_REPLAY_SPEED]
+                )
+            except CannotConnect:
+                errors["base"] = "cannot_replay"
+
+            if not errors:
+                return self.async_create_entry(title="RFXTRX replay", data=data)
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_REPLAY_PATH, default=CAPTURE_FILENAME): str,
+                vol.Required(CONF_REPLAY_SPEED, default=1.0): vol.All(
+                    vol.Coerce(float), vol.Range(min=0)
+                ),
+            }
+        )
+        return self.async_show_form(
+            step_id="setup_replay",
+            data_schema=schema,
+            errors=errors,
+        )
+
     async def async_validate_rfx(
         self,
         host: str | None = None,
         port: int | None = None,
         device: str | None = None,
+        replay_path: str | None = None,
+        replay_speed: float = 1.0,
     ) -> dict[str, Any]:
         """Create data for rfxtrx entry."""
         success = await self.hass.async_add_executor_job(
-            _test_transport, host, port, device
+            _test_transport, host, port, device, replay_path
         )
         if not success:
             raise CannotConnect
@@ -641,6 +705,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             CONF_AUTOMATIC_ADD: False,
             CONF_DEVICES: {},
         }
+        if replay_path is not None:
+            data[CONF_REPLAY_PATH] = replay_path
+            data[CONF_REPLAY_SPEED] = replay_speed
         return data
 
     @staticmethod
@@ -650,9 +717,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return OptionsFlow(config_entry)
 
 
-def _test_transport(host: str | None, port: int | None, device: str | None) -> bool:
+def _test_transport(
+    host: str | None,
+    port: int | None,
+    device: str | None,
+    replay_path: str | None = None,
+) -> bool:
     """Construct a rfx object based on config."""
-    if port is not None:
+    if replay_path is not None:
+        conn = ReplayTransport(replay_path)
+    elif port is not None:
         conn = rfxtrxmod.PyNetworkTransport((host, port))
     else:
         conn = rfxtrxmod.PySerialTransport(device)
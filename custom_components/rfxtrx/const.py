@@ -5,6 +5,11 @@ CONF_AUTOMATIC_ADD = "automatic_add"
 CONF_OFF_DELAY = "off_delay"
 CONF_VENETIAN_BLIND_MODE = "venetian_blind_mode"
 CONF_PROTOCOLS = "protocols"
+CONF_SUPPRESSED_EVENT_TYPES = "suppressed_event_types"
+CONF_DEDUPE_WINDOW = "dedupe_window"
+CONF_TRANSMIT_GAP = "transmit_gap"
+CONF_REPLAY_PATH = "replay_path"
+CONF_REPLAY_SPEED = "replay_speed"
 
 CONF_REPLACE_DEVICE = "replace_device"
 
@@ -36,13 +41,24 @@ COMMAND_GROUP_LIST = [
 ]
 
 ATTR_EVENT = "event"
+ATTR_ENABLED = "enabled"
+ATTR_COMPRESS = "compress"
 
 SERVICE_SEND = "send"
+SERVICE_CAPTURE = "capture"
 
 DEVICE_PACKET_TYPE_LIGHTING4 = 0x13
 
 EVENT_RFXTRX_EVENT = "rfxtrx_event"
 
-DATA_RFXOBJECT = "rfxobject"
+DATA_CONNECTION = "connection"
+DATA_CAPTURE = "capture"
+DATA_EVENT_ROUTER = "event_router"
+DATA_DEDUPLICATOR = "deduplicator"
+DATA_RECEIVE_QUEUE = "receive_queue"
+DATA_RECEIVE_METRICS = "receive_metrics"
+DATA_TRANSMITTER = "transmitter"
+DATA_PARSED_DEVICES = "parsed_devices"
+DATA_PLATFORM_DEVICES = "platform_devices"
 
 DOMAIN = "rfxtrx"
@@ -8,7 +8,7 @@ import RFXtrx as rfxtrxmod
 
 from homeassistant.components.cover import CoverEntity, CoverEntityFeature
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_OPEN
+from homeassistant.const import STATE_OPEN, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -68,7 +68,7 @@ async def async_setup_entry(
         ]
 
     await async_setup_platform_entry(
-        hass, config_entry, async_add_entities, supported, _constructor
+        hass, config_entry, async_add_entities, Platform.COVER, _constructor
     )
 
     ##############################
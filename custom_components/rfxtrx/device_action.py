@@ -13,8 +13,10 @@ from homeassistant.core import Context, HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.typing import ConfigType, TemplateVarsType
 
-from . import DATA_RFXOBJECT, DOMAIN
+from . import DOMAIN
+from .const import DATA_TRANSMITTER
 from .helpers import async_get_device_object
+from .transmit import TransmitPriority
 
 CONF_DATA = "data"
 CONF_SUBTYPE = "subtype"
@@ -101,11 +103,11 @@ async def async_call_action_from_config(
     """Execute a device action."""
     config = ACTION_SCHEMA(config)
 
-    rfx = hass.data[DOMAIN][DATA_RFXOBJECT]
+    transmitter = hass.data[DOMAIN][DATA_TRANSMITTER]
     commands, send_fun = _get_commands(hass, config[CONF_DEVICE_ID], config[CONF_TYPE])
     sub_type = config[CONF_SUBTYPE]
 
     for key, value in commands.items():
         if value == sub_type:
-            await hass.async_add_executor_job(send_fun, rfx.transport, key)
+            await transmitter.async_send(send_fun, key, priority=TransmitPriority.BULK)
             return
@@ -7,6 +7,15 @@ from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from .const import (
+    DATA_CAPTURE,
+    DATA_RECEIVE_METRICS,
+    DATA_RECEIVE_QUEUE,
+    DATA_TRANSMITTER,
+    DOMAIN,
+)
+from .ext.somfy_group_planner import DATA_GROUP_PLANNER
+
 TO_REDACT = {"host"}
 
 
@@ -14,6 +23,18 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    metrics = hass.data[DOMAIN][DATA_RECEIVE_METRICS]
+    receive_queue = hass.data[DOMAIN][DATA_RECEIVE_QUEUE]
+    transmitter = hass.data[DOMAIN][DATA_TRANSMITTER]
+    capture = hass.data[DOMAIN][DATA_CAPTURE]
+    planner = hass.data[DOMAIN].get(DATA_GROUP_PLANNER)
     return {
         "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "receive": {
+            **metrics.as_dict(),
+            "queue": receive_queue.as_dict(),
+        },
+        "transmit": transmitter.as_dict(),
+        "somfy_groups": planner.as_dict() if planner is not None else None,
+        "capture": capture.as_dict(),
     }
@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 import asyncio
+import time
 from collections.abc import Callable
 
 import RFXtrx as rfxtrxmod
@@ -23,10 +24,12 @@ from homeassistant.components.cover import (
 )
 
 from .. import DeviceTuple, RfxtrxCommandEntity, _Ts
+from ..transmit import TransmitTiming
 from ..const import CONF_VENETIAN_BLIND_MODE
 
 from .const import (
     CONF_CLOSE_SECONDS,
+    CONF_COALESCE_MS,
     CONF_COLOUR_ICON,
     CONF_CUSTOM_ICON,
     CONF_OPEN_SECONDS,
@@ -37,6 +40,7 @@ from .const import (
     CONF_TILT_POS1_MS,
     CONF_TILT_POS2_MS,
     DEF_CLOSE_SECONDS,
+    DEF_COALESCE_MS,
     DEF_COLOUR_ICON,
     DEF_CUSTOM_ICON,
     DEF_OPEN_SECONDS,
@@ -45,7 +49,9 @@ from .const import (
     DEF_SYNC_SECONDS,
     DEF_TILT_POS1_MS,
     DEF_TILT_POS2_MS,
+    MOVE_PADDING_SHARE,
 )
+from .cover_movement import CoverMovementMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -54,7 +60,7 @@ TILT_MID_STEP = 2
 TILT_MAX_STEP = 4
 
 
-class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
+class AbstractTiltingCover(CoverMovementMixin, RfxtrxCommandEntity, CoverEntity):
     """Representation of a RFXtrx cover supporting tilt and, optionally, lift."""
 
     _device: rfxtrxmod.RollerTrolDevice | rfxtrxmod.RfyDevice | rfxtrxmod.LightingDevice
@@ -100,6 +106,7 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
         self._myattr_custom_icon = entity_info.get(CONF_CUSTOM_ICON, DEF_CUSTOM_ICON)
         self._myattr_colour_open = entity_info.get(CONF_COLOUR_ICON, DEF_COLOUR_ICON)
         self._myattr_partial_is_closed = entity_info.get(CONF_PARTIAL_CLOSED, DEF_PARTIAL_CLOSED)
+        self._myattr_coalesce_secs = entity_info.get(CONF_COALESCE_MS, DEF_COALESCE_MS) / 1000
 
         self._myattr_tilt_pos1_secs = entity_info.get(CONF_TILT_POS1_MS, DEF_TILT_POS1_MS) / 1000
         self._myattr_tilt_pos2_secs = entity_info.get(CONF_TILT_POS2_MS, DEF_TILT_POS2_MS) / 1000
@@ -107,6 +114,15 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
         self._myattr_is_raised = True
         self._myattr_tilt_step = TILT_MIN_STEP
 
+        # Time the motor should have stopped by, and the position it then reaches
+        self._myattr_move_end = None
+
+        # The task moving the cover, replaced by each new request
+        self._myattr_movement = None
+
+        # Number of the latest request, to tell if a waiting request was replaced
+        self._myattr_requests = 0
+
 
     async def async_added_to_hass(self) -> None:
         """Restore device state."""
@@ -127,61 +143,37 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
-        if not(self._is_moving):
-            if ATTR_POSITION in kwargs:
-                position = kwargs[ATTR_POSITION]
-                if position > 85:
-                    _LOGGER.debug("async_set_cover_position: RAISING cover")
-                    await self._async_raise_blind()
-                    await self._async_wait_and_set_position(self._myattr_open_secs, True, TILT_MIN_STEP)
-                elif position < 15:
-                    _LOGGER.debug("async_set_cover_position: closing cover to CLOSED")
-                    await self._async_tilt_blind_to_step(TILT_MIN_STEP)
-                else:
-                    _LOGGER.debug("async_set_cover_position: closing cover to OPEN")
-                    await self._async_tilt_blind_to_step(TILT_MID_STEP)
-        else:
-            _LOGGER.debug("async_set_cover_position: cover is in motion - ignoring")
+        if ATTR_POSITION in kwargs:
+            await self._async_run_coalesced_movement(self._async_set_blind_position, kwargs[ATTR_POSITION])
 
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the entity."""
-        if self._is_moving:
-            _LOGGER.debug("toggle: cover is in motion - ignoring")
-        else:
-            if self._myattr_is_raised or self._myattr_tilt_step != TILT_MIN_STEP:
-                await self._async_tilt_blind_to_step(TILT_MIN_STEP)
-            else:
-                await self._async_tilt_blind_to_step(TILT_MID_STEP)
+        await self._async_run_movement(self._async_toggle_blind)
 
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Move the cover up."""
-        if not(self._is_moving):
-            _LOGGER.debug("async_open_cover: tilting cover to open")
-            await self._async_tilt_blind_to_step(TILT_MID_STEP)
-        else:
-            _LOGGER.debug("async_open_cover: cover is in motion - ignoring")
+        _LOGGER.debug("async_open_cover: tilting cover to open")
+        await self._async_run_movement(self._async_tilt_blind_to_step, TILT_MID_STEP)
 
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Move the cover down."""
-        if not(self._is_moving):
-            _LOGGER.debug("async_close_cover: tilting cover to closed")
-            await self._async_tilt_blind_to_step(TILT_MIN_STEP)
-        else:
-            _LOGGER.debug("async_close_cover: cover is in motion - ignoring")
+        _LOGGER.debug("async_close_cover: tilting cover to closed")
+        await self._async_run_movement(self._async_tilt_blind_to_step, TILT_MIN_STEP)
 
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        if not(self._is_moving):
+        # Also drop any request still waiting to be planned
+        self._myattr_requests += 1
+
+        if not(self._is_moving) and not(self._is_movement_running):
             _LOGGER.debug("async_stop_cover: cover is not in motion - ignoring")
         else:
             _LOGGER.debug("async_stop_cover: stopping cover")
-            self._attr_is_closing = False
-            self._attr_is_opening = False
-            self.async_write_ha_state()
+            await self._async_run_movement(self._async_halt)
 
 
     async def async_toggle_tilt(self, **kwargs: Any) -> None:
@@ -191,43 +183,35 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
 
     async def async_open_cover_tilt(self, **kwargs: Any) -> None:
         """Tilt the cover up."""
-        if not(self._is_moving):
-            _LOGGER.debug("async_open_cover_tilt: increasing tilt pos")
-            await self._async_tilt_blind_to_step(self._myattr_tilt_step + 1)
-        else:
-            _LOGGER.debug("async_open_cover_tilt: cover is in motion - ignoring")
+        _LOGGER.debug("async_open_cover_tilt: increasing tilt pos")
+        await self._async_run_movement(self._async_tilt_blind_by_steps, 1)
 
 
     async def async_close_cover_tilt(self, **kwargs: Any) -> None:
         """Tilt the cover down."""
-        if not(self._is_moving):
-            _LOGGER.debug("async_close_cover_tilt: decreasing tilt pos")
-            await self._async_tilt_blind_to_step(self._myattr_tilt_step - 1)
-        else:
-            _LOGGER.debug("async_close_cover_tilt: cover is in motion - ignoring")
+        _LOGGER.debug("async_close_cover_tilt: decreasing tilt pos")
+        await self._async_run_movement(self._async_tilt_blind_by_steps, -1)
 
 
     async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
         """Move the cover tilt to a specific position."""
-        if not(self._is_moving):
-            if ATTR_TILT_POSITION in kwargs:
-                tilt_position = self._tilt_to_steps(kwargs[ATTR_TILT_POSITION])
+        if ATTR_TILT_POSITION in kwargs:
+            tilt_position = self._tilt_to_steps(kwargs[ATTR_TILT_POSITION])
 
-                _LOGGER.debug("async_set_cover_tilt_position: setting position " + str(tilt_position))
-                await self._async_tilt_blind_to_step(tilt_position)
-        else:
-            _LOGGER.debug("async_set_cover_tilt_position: cover is in motion - ignoring")
+            _LOGGER.debug("async_set_cover_tilt_position: setting position " + str(tilt_position))
+            await self._async_run_coalesced_movement(self._async_tilt_blind_to_step, tilt_position)
 
 
     async def async_stop_cover_tilt(self, **kwargs: Any) -> None:
         """Stop the cover tilt."""
-        if not(self._is_moving):
+        # Also drop any request still waiting to be planned
+        self._myattr_requests += 1
+
+        if not(self._is_moving) and not(self._is_movement_running):
             _LOGGER.debug("async_stop_cover_tilt: cover is not in motion - ignoring")
         else:
             _LOGGER.debug("async_stop_cover_tilt: stopping cover tilt")
-            self._attr_is_closing = False
-            self._attr_is_opening = False
-            self.async_write_ha_state()
+            await self._async_run_movement(self._async_halt)
 
 
     async def async_update_cover_position(self, **kwargs) -> None:
@@ -341,30 +325,87 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
 
         self._attr_is_opening = False
         self._attr_is_closing = False
+        self._myattr_move_end = None
 
         _LOGGER.debug("_set_position; set new position - raised = " + str(self._myattr_is_raised) + " tilt = " + str(self._myattr_tilt_step))
 
 
+    def _set_moving(self, is_raised, tilt_step) -> None:
+        """Set the direction of motion towards a new position."""
+        if is_raised and not(self._myattr_is_raised):
+            self._attr_is_closing = False
+            self._attr_is_opening = True
+        elif not(is_raised) and self._myattr_is_raised:
+            self._attr_is_closing = True
+            self._attr_is_opening = False
+        elif tilt_step <= TILT_MIN_STEP or tilt_step >= TILT_MAX_STEP:
+            self._attr_is_closing = True
+            self._attr_is_opening = False
+        elif tilt_step == TILT_MID_STEP:
+            self._attr_is_closing = False
+            self._attr_is_opening = True
+        else:
+            self._attr_is_closing = self._myattr_partial_is_closed
+            self._attr_is_opening = not(self._myattr_partial_is_closed)
+
+
+    async def _async_movement(self, fun, *args) -> None:
+        """Run a movement, first stopping the motor if a cancelled movement left it running."""
+        await self._async_halt()
+        await fun(*args)
+
+
+    async def _async_halt(self) -> None:
+        """Stop the motor if it is moving.
+
+        A move past its travel time is left to finish and its position is
+        set. Otherwise the position the cover was moving to is unknown so
+        the state is left as it was before the movement.
+        """
+        move_end = self._myattr_move_end
+        if self._is_moving and move_end is not None and time.monotonic() >= move_end[0]:
+            _LOGGER.debug("_async_halt: interrupted movement has finished")
+            self._set_position(move_end[1], move_end[2])
+            self.async_write_ha_state()
+        elif self._is_moving:
+            _LOGGER.debug("_async_halt: stopping interrupted movement")
+            self._attr_is_closing = False
+            self._attr_is_opening = False
+            self.async_write_ha_state()
+
+            await self._async_stop_blind()
+
+
+    async def _async_set_blind_position(self, position) -> None:
+        if position > 85:
+            _LOGGER.debug("async_set_cover_position: RAISING cover")
+            await self._async_raise_blind()
+            await self._async_wait_and_set_position(self._myattr_open_secs, True, TILT_MIN_STEP)
+        elif position < 15:
+            _LOGGER.debug("async_set_cover_position: closing cover to CLOSED")
+            await self._async_tilt_blind_to_step(TILT_MIN_STEP)
+        else:
+            _LOGGER.debug("async_set_cover_position: closing cover to OPEN")
+            await self._async_tilt_blind_to_step(TILT_MID_STEP)
+
+
+    async def _async_toggle_blind(self) -> None:
+        if self._myattr_is_raised or self._myattr_tilt_step != TILT_MIN_STEP:
+            await self._async_tilt_blind_to_step(TILT_MIN_STEP)
+        else:
+            await self._async_tilt_blind_to_step(TILT_MID_STEP)
+
+
+    async def _async_tilt_blind_by_steps(self, steps) -> None:
+        await self._async_tilt_blind_to_step(self._myattr_tilt_step + steps)
+
+
     async def _async_wait_and_set_position(self, delay, is_raised, tilt_step) -> None:
         if delay > 0:
             _LOGGER.info("_async_wait_and_set_position: Waiting secs = " + str(delay))
 
-            if is_raised and not(self._myattr_is_raised):
-                self._attr_is_closing = False
-                self._attr_is_opening = True
-            elif not(is_raised) and self._myattr_is_raised:
-                self._attr_is_closing = True
-                self._attr_is_opening = False
-            elif tilt_step <= TILT_MIN_STEP or tilt_step >= TILT_MAX_STEP:
-                self._attr_is_closing = True
-                self._attr_is_opening = False
-            elif tilt_step == TILT_MID_STEP:
-                self._attr_is_closing = False
-                self._attr_is_opening = True
-            else:
-                self._attr_is_closing = self._myattr_partial_is_closed
-                self._attr_is_opening = not(self._myattr_partial_is_closed)
-
+            self._set_moving(is_raised, tilt_step)
+            self._myattr_move_end = (time.monotonic() + delay * (1 - MOVE_PADDING_SHARE), is_raised, tilt_step)
             self.async_write_ha_state()
 
             await asyncio.sleep(delay)
@@ -409,13 +450,13 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
         raise Exception("_async_tilt_blind_to_mid_step has not been implemented")
 
 
-    async def _async_send(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> None:
+    async def _async_send(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> TransmitTiming:
         """Send a command to the motor."""
         _LOGGER.info("Invoked _async_send; command = " + fun.__name__)
-        await super()._async_send(fun, *args)
+        return await super()._async_send(fun, *args)
 
 
-    async def _async_send_repeat(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> None:
+    async def _async_send_repeat(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> TransmitTiming:
         """Repeating send a command to the motor."""
         _LOGGER.info("Invoked _async_send_repeat; command = " + fun.__name__)
 
@@ -423,4 +464,4 @@ class AbstractTiltingCover(RfxtrxCommandEntity, CoverEntity):
             for _ in range(self._myattr_repetitions - 1):
                 await self._async_send(fun, *args)
                 await asyncio.sleep(self._myattr_repetition_delay)
-        await self._async_send(fun, *args)
\ No newline at end of file
+        return await self._async_send(fun, *args)
\ No newline at end of file
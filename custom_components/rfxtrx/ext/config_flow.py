@@ -3,7 +3,11 @@ import voluptuous as vol
 import logging
 
 from .const import (
+    CONF_COALESCE_MS,
+    CONF_GROUP_MEMBERS,
     CONF_ROLLER_MID_ON_CLOSE,
+    DEF_COALESCE_MS,
+    DEF_GROUP_MEMBERS,
     DEF_ROLLER_MID_ON_CLOSE,
     DEF_STATE_SUPPORT,
     DEF_CLOSE_SECONDS,
@@ -14,6 +18,7 @@ from .const import (
     DEF_SYNC_MID,
     DEF_TILT_POS1_MS,
     DEF_TILT_POS2_MS,
+    DEF_TILT_CALIBRATION,
     DEF_CUSTOM_ICON,
     DEF_COLOUR_ICON,
     DEF_PARTIAL_CLOSED,
@@ -28,6 +33,7 @@ from .const import (
     CONF_SYNC_MID,
     CONF_TILT_POS1_MS,
     CONF_TILT_POS2_MS,
+    CONF_TILT_CALIBRATION,
     CONF_CUSTOM_ICON,
     CONF_COLOUR_ICON,
     CONF_PARTIAL_CLOSED,
@@ -51,12 +57,15 @@ def update_device_options(device, user_input) -> None:
     device[CONF_SYNC_SECONDS] = user_input.get(CONF_SYNC_SECONDS, DEF_SYNC_SECONDS)
     device[CONF_TILT_POS1_MS] = user_input.get(CONF_TILT_POS1_MS, DEF_TILT_POS1_MS)
     device[CONF_TILT_POS2_MS] = user_input.get(CONF_TILT_POS2_MS, DEF_TILT_POS2_MS)
+    device[CONF_TILT_CALIBRATION] = user_input.get(CONF_TILT_CALIBRATION, DEF_TILT_CALIBRATION)
     device[CONF_CUSTOM_ICON] = user_input.get(CONF_CUSTOM_ICON, DEF_CUSTOM_ICON)
     device[CONF_COLOUR_ICON] = user_input.get(CONF_COLOUR_ICON, DEF_COLOUR_ICON)
     device[CONF_PARTIAL_CLOSED] = user_input.get(CONF_PARTIAL_CLOSED, DEF_PARTIAL_CLOSED)
     device[CONF_SIGNAL_REPETITIONS] = user_input.get(CONF_SIGNAL_REPETITIONS, DEF_SIGNAL_REPETITIONS)
     device[CONF_SIGNAL_REPETITIONS_DELAY_MS] = user_input.get(CONF_SIGNAL_REPETITIONS_DELAY_MS, DEF_SIGNAL_REPETITIONS_DELAY_MS)
     device[CONF_ROLLER_MID_ON_CLOSE] = user_input.get(CONF_ROLLER_MID_ON_CLOSE, DEF_ROLLER_MID_ON_CLOSE)
+    device[CONF_COALESCE_MS] = user_input.get(CONF_COALESCE_MS, DEF_COALESCE_MS)
+    device[CONF_GROUP_MEMBERS] = user_input.get(CONF_GROUP_MEMBERS, DEF_GROUP_MEMBERS)
 
 
 def update_data_schema(data_schema, device_object, device_data) -> None:
@@ -104,6 +113,16 @@ def update_data_schema(data_schema, device_object, device_data) -> None:
                     default=device_data.get(
                         CONF_TILT_POS2_MS, DEF_TILT_POS2_MS),
                 ): int,
+                vol.Optional(
+                    CONF_TILT_CALIBRATION,
+                    default=device_data.get(
+                        CONF_TILT_CALIBRATION, DEF_TILT_CALIBRATION),
+                ): str,
+                vol.Optional(
+                    CONF_COALESCE_MS,
+                    default=device_data.get(
+                        CONF_COALESCE_MS, DEF_COALESCE_MS),
+                ): int,
                 vol.Optional(
                     CONF_CUSTOM_ICON,
                     default=device_data.get(
@@ -123,7 +142,12 @@ def update_data_schema(data_schema, device_object, device_data) -> None:
                     CONF_ROLLER_MID_ON_CLOSE,
                     default=device_data.get(
                         CONF_ROLLER_MID_ON_CLOSE, DEF_ROLLER_MID_ON_CLOSE),
-                ): bool
+                ): bool,
+                vol.Optional(
+                    CONF_GROUP_MEMBERS,
+                    default=device_data.get(
+                        CONF_GROUP_MEMBERS, DEF_GROUP_MEMBERS),
+                ): str
             }
         )
     elif device_object.device.packettype == DEVICE_PACKET_TYPE_BLINDS1 and device_object.device.subtype == DEVICE_PACKET_SUBTYPE_BLINDST19:
@@ -155,6 +179,11 @@ def update_data_schema(data_schema, device_object, device_data) -> None:
                     default=device_data.get(
                         CONF_CLOSE_SECONDS, DEF_CLOSE_SECONDS),
                 ): int,
+                vol.Optional(
+                    CONF_COALESCE_MS,
+                    default=device_data.get(
+                        CONF_COALESCE_MS, DEF_COALESCE_MS),
+                ): int,
                 vol.Optional(
                     CONF_CUSTOM_ICON,
                     default=device_data.get(
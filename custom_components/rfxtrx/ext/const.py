@@ -8,6 +8,7 @@ CONF_PARTIAL_CLOSED = "partial_closed"
 CONF_SIGNAL_REPETITIONS_DELAY_MS = "signal_repetition_delay"
 CONF_SIGNAL_REPETITIONS = "signal_repetitions"
 CONF_ROLLER_MID_ON_CLOSE = "roller_mid_on_close"
+CONF_COALESCE_MS = "coalesce_ms"
 
 CONF_SUPPORTS_MID = "midpoint_supported"
 CONF_STEPS_MID = "midpoint_steps"
@@ -15,6 +16,9 @@ CONF_SYNC_MID = "midpoint_sync"
 
 CONF_TILT_POS1_MS = "tilt1_ms"
 CONF_TILT_POS2_MS = "tilt2_ms"
+CONF_TILT_CALIBRATION = "tilt_calibration"
+
+CONF_GROUP_MEMBERS = "group_members"
 
 DEF_STATE_SUPPORT = True
 DEF_CLOSE_SECONDS = 30
@@ -29,9 +33,18 @@ DEF_PARTIAL_CLOSED = True
 DEF_SIGNAL_REPETITIONS_DELAY_MS = 250
 DEF_SIGNAL_REPETITIONS = 1
 DEF_ROLLER_MID_ON_CLOSE = True
+DEF_COALESCE_MS = 250
 
 DEF_TILT_POS1_MS = 1750
 DEF_TILT_POS2_MS = 1750
+DEF_TILT_CALIBRATION = ""
+
+DEF_GROUP_MEMBERS = ""
+
+# Share of the configured time of a move assumed to be padding. A move past
+# the rest has finished, so it is not stopped as a stop sent to a Somfy motor
+# at rest sends it to the my position
+MOVE_PADDING_SHARE = 0.2
 
 DEVICE_PACKET_TYPE_BLINDS1 = 0x19
 DEVICE_PACKET_SUBTYPE_BLINDST19 = 0x13
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import logging
 from typing import Any
 import voluptuous as vol
@@ -48,6 +49,9 @@ def create_cover_entity(device, device_id, entity_info, event=None) -> CoverEnti
     _LOGGER.debug("State support  = " + str(stateSupport))
 
     if stateSupport:
+        # The parsed device is shared with the other platforms and our covers change its type string
+        device = copy.copy(device)
+
         if int(device_id[0], 16) == DEVICE_PACKET_TYPE_BLINDS1 and int(device_id[1], 16) == DEVICE_PACKET_SUBTYPE_BLINDST19:
             _LOGGER.info("Detected a Louvolite Vogue vertical blind - let's go stateful!")
             return LouvoliteVogueBlind(
@@ -0,0 +1,81 @@
+"""Movement handling shared by the RFXtrx covers."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CoverMovementMixin:
+    """Run each movement of a cover as the only one, latest request first.
+
+    The cover sets _myattr_movement, _myattr_requests and
+    _myattr_coalesce_secs in its __init__.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Cancel the running movement when the cover is removed."""
+        await super().async_added_to_hass()
+
+        self.async_on_remove(self._cancel_movement)
+
+
+    async def _async_run_coalesced_movement(self, fun, *args) -> None:
+        """Run a movement unless a newer request arrives within the coalescing window.
+
+        Sliders and voice assistants send bursts of position requests, so
+        only the last of a burst is planned and sent.
+        """
+        metrics = self._async_request_metrics()
+        metrics.record()
+
+        self._myattr_requests += 1
+        request = self._myattr_requests
+        if self._myattr_coalesce_secs > 0:
+            await asyncio.sleep(self._myattr_coalesce_secs)
+
+        if request != self._myattr_requests:
+            _LOGGER.debug("_async_run_coalesced_movement: request replaced by a newer one")
+            metrics.record_collapsed()
+            return
+
+        await self._async_run_movement(fun, *args)
+
+
+    async def _async_run_movement(self, fun, *args) -> None:
+        """Run a movement as the only movement of the cover.
+
+        A movement already running is cancelled, so the latest request
+        always wins. Any request still waiting to be coalesced is dropped.
+        """
+        self._myattr_requests += 1
+
+        while (task := self._myattr_movement) is not None and not(task.done()):
+            _LOGGER.debug("_async_run_movement: cancelling the running movement")
+            task.cancel()
+            await asyncio.wait([task])
+
+        task = self._myattr_movement = self.hass.async_create_task(self._async_movement(fun, *args))
+        await asyncio.wait([task])
+        if not(task.cancelled()):
+            task.result()
+
+
+    @property
+    def _is_movement_running(self) -> bool:
+        """Return True while a movement of the cover is running."""
+        return self._myattr_movement is not None and not(self._myattr_movement.done())
+
+
+    async def _async_movement(self, fun, *args) -> None:
+        """Run a movement, overridden to prepare the motor for it."""
+        await fun(*args)
+
+
+    @callback
+    def _cancel_movement(self) -> None:
+        if self._myattr_movement is not None:
+            self._myattr_movement.cancel()
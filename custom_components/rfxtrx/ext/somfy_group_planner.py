@@ -0,0 +1,173 @@
+"""Plan Somfy group channel commands for RFXtrx venetian blinds."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from ..const import DOMAIN
+
+if TYPE_CHECKING:
+    from .somfy_venetian_blind import SomfyVenetianBlind
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_GROUP_PLANNER = "somfy_group_planner"
+
+# How long to collect tilt requests before deciding how to send them
+PLAN_WINDOW_SECS = 0.1
+
+# Plan of a request replaced by a newer request for the same blind
+PLAN_SUPERSEDED = "superseded"
+
+
+def parse_group_members(members) -> list[str]:
+    """Return the Somfy ids, e.g. 010601:1, from a comma separated list."""
+    if not members:
+        return []
+    return [member.strip().lower() for member in members.split(",") if member.strip()]
+
+
+def get_group_planner(hass: HomeAssistant) -> SomfyGroupPlanner:
+    """Return the group planner, creating it on first use."""
+    planner = hass.data[DOMAIN].get(DATA_GROUP_PLANNER)
+    if planner is None:
+        planner = hass.data[DOMAIN][DATA_GROUP_PLANNER] = SomfyGroupPlanner(hass)
+    return planner
+
+
+class SomfyGroupPlanner:
+    """Send one group command when every blind of a Somfy group has the same target.
+
+    A scene moving all the blinds of a group would otherwise send a full
+    command sequence per blind. Tilt requests for blinds belonging to a
+    group are collected for a short window. If every member of a group is
+    asked for the same tilt step then the group channel is moved once and
+    the state of each member is taken from it. Anything else is sent to
+    the individual blinds as before.
+
+    Only requests ending at a tilt step, including open and close, are
+    planned together. Lifting a blind and tilts between steps are always
+    sent to the individual blinds. A group move is
+    skipped while the group channel itself is moving, but does not stop a
+    member from being moved on its own at the same time as the group.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the planner with no blinds registered."""
+        self._hass = hass
+        self._blinds: dict[str, SomfyVenetianBlind] = {}
+        self._groups: dict[str, list[str]] = {}
+        self._pending: dict[str, tuple[int, asyncio.Future]] = {}
+        self._cancel_flush: CALLBACK_TYPE | None = None
+        self.group_commands = 0
+        self.saved_commands = 0
+
+
+    @callback
+    def async_register(self, blind: SomfyVenetianBlind, members: list[str]) -> CALLBACK_TYPE:
+        """Register a blind and, for a group channel, its members."""
+        id_string = blind.somfy_id
+        self._blinds[id_string] = blind
+        if members:
+            _LOGGER.debug("Registered Somfy group " + id_string + " with members " + str(members))
+            self._groups[id_string] = members
+
+        @callback
+        def _async_unregister() -> None:
+            self._blinds.pop(id_string, None)
+            self._groups.pop(id_string, None)
+
+        return _async_unregister
+
+
+    def as_dict(self) -> dict:
+        """Return the groups and the commands saved by moving them together."""
+        return {
+            "groups": dict(self._groups),
+            "group_commands": self.group_commands,
+            "saved_commands": self.saved_commands,
+        }
+
+
+    def _is_grouped(self, id_string) -> bool:
+        return id_string in self._groups or any(
+            id_string in members for members in self._groups.values()
+        )
+
+
+    async def async_tilt(self, blind: SomfyVenetianBlind, tilt_step) -> None:
+        """Tilt a blind, through its group channel if possible."""
+        id_string = blind.somfy_id
+        if not self._is_grouped(id_string):
+            await blind._async_move_tilt_to_step(tilt_step)
+            return
+
+        previous = self._pending.pop(id_string, None)
+        if previous is not None and not previous[1].done():
+            previous[1].set_result(PLAN_SUPERSEDED)
+
+        future = self._hass.loop.create_future()
+        self._pending[id_string] = (tilt_step, future)
+        if self._cancel_flush is None:
+            self._cancel_flush = async_call_later(self._hass, PLAN_WINDOW_SECS, self._async_flush)
+
+        try:
+            plan = await future
+        except asyncio.CancelledError:
+            # Replaced by a request which is not a tilt, e.g. a stop
+            if self._pending.get(id_string, (None, None))[1] is future:
+                del self._pending[id_string]
+            raise
+
+        if plan is None:
+            await blind._async_move_tilt_to_step(tilt_step)
+        elif plan is PLAN_SUPERSEDED:
+            _LOGGER.debug("async_tilt: request for " + id_string + " superseded")
+        else:
+            group, task = plan
+            if blind is group:
+                # The group move replaces this movement of the group channel
+                await asyncio.shield(task)
+            else:
+                await blind._async_follow_group_move(group, tilt_step, task)
+
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        """Decide which pending requests can be sent as one group command."""
+        self._cancel_flush = None
+        pending, self._pending = self._pending, {}
+
+        for group_id, members in sorted(self._groups.items(), key=lambda item: -len(item[1])):
+            group = self._blinds.get(group_id)
+            if group is None or group._is_moving:
+                continue
+            if any(member not in pending for member in members):
+                continue
+
+            targets = {pending[member][0] for member in members}
+            if group_id in pending:
+                targets.add(pending[group_id][0])
+            if len(targets) != 1:
+                continue
+
+            tilt_step = targets.pop()
+            _LOGGER.info("Moving Somfy group " + group_id + " to tilt step " + str(tilt_step) + " for " + str(len(members)) + " blinds")
+            self.group_commands += 1
+            self.saved_commands += len(members) - (0 if group_id in pending else 1)
+
+            task = self._hass.async_create_task(
+                group._async_run_movement(group._async_move_group_to_step, tilt_step)
+            )
+            for id_string in (*members, group_id):
+                entry = pending.pop(id_string, None)
+                if entry is not None and not entry[1].done():
+                    entry[1].set_result((group, task))
+
+        for _, future in pending.values():
+            if not future.done():
+                future.set_result(None)
@@ -4,6 +4,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 import asyncio
+import time
 from collections.abc import Callable
 
 import RFXtrx as rfxtrxmod
@@ -17,9 +18,11 @@ from homeassistant.components.cover import (
 )
 
 from .. import DeviceTuple, RfxtrxCommandEntity, _Ts
+from ..transmit import TransmitTiming
 
 from .const import (
     CONF_CLOSE_SECONDS,
+    CONF_COALESCE_MS,
     CONF_COLOUR_ICON,
     CONF_CUSTOM_ICON,
     CONF_OPEN_SECONDS,
@@ -29,6 +32,7 @@ from .const import (
     CONF_SIGNAL_REPETITIONS_DELAY_MS,
     CONF_SYNC_SECONDS,
     DEF_CLOSE_SECONDS,
+    DEF_COALESCE_MS,
     DEF_COLOUR_ICON,
     DEF_CUSTOM_ICON,
     DEF_OPEN_SECONDS,
@@ -36,7 +40,9 @@ from .const import (
     DEF_ROLLER_MID_ON_CLOSE,
     DEF_SIGNAL_REPETITIONS_DELAY_MS,
     DEF_SYNC_SECONDS,
+    MOVE_PADDING_SHARE,
 )
+from .cover_movement import CoverMovementMixin
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,10 +52,16 @@ LIFT_POS_CLOSED = 0
 LIFT_POS_MID = 1
 LIFT_POS_OPEN = 2
 
+# Positions within this of fully open or closed are moved to the end stop
+POSITION_END_MARGIN = 2
+
+# How often the estimated position is updated while the blind travels
+POSITION_UPDATE_SECS = 1.0
+
 # Event 071a000002010101 Kitchen
 
 
-class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
+class SomfyRollerBlind(CoverMovementMixin, RfxtrxCommandEntity, CoverEntity):
     """Representation of a SomfyRollerBlind RFXtrx cover supporting lift."""
 
     _device: rfxtrxmod.RollerTrolDevice | rfxtrxmod.RfyDevice | rfxtrxmod.LightingDevice
@@ -85,9 +97,28 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
         self._myattr_colour_open = entity_info.get(CONF_COLOUR_ICON, DEF_COLOUR_ICON)
         self._myattr_partial_is_closed = entity_info.get(CONF_PARTIAL_CLOSED, DEF_PARTIAL_CLOSED)
         self._myattr_close_to_mid = entity_info.get(CONF_ROLLER_MID_ON_CLOSE, DEF_ROLLER_MID_ON_CLOSE)
+        self._myattr_coalesce_secs = entity_info.get(CONF_COALESCE_MS, DEF_COALESCE_MS) / 1000
 
         self._myattr_lift_step = LIFT_POS_CLOSED
 
+        # Estimated lift position, 0 is closed and 100 is open
+        self._myattr_position = 0.0
+
+        # Start time, start position and direction of the current travel
+        self._myattr_travel = None
+
+        # The stop ending the travel, once it is with the transmitter
+        self._myattr_travel_stop = None
+
+        # Time the motor should have stopped by, and the position it then reaches
+        self._myattr_move_end = None
+
+        # The task moving the cover, replaced by each new request
+        self._myattr_movement = None
+
+        # Number of the latest request, to tell if a waiting request was replaced
+        self._myattr_requests = 0
+
 
     async def async_added_to_hass(self) -> None:
         """Restore device state."""
@@ -99,71 +130,58 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
                 old_pos = old_state.attributes['current_position']
                 _LOGGER.info("async_added_to_hass: old_pos = " + str(old_pos))
 
-                self._set_position(self._pos_to_steps(old_pos))
+                self._set_lift_position(old_pos)
 
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Move the cover to a specific position."""
-        if not(self._is_moving):
-            if ATTR_POSITION in kwargs:
-                position = kwargs[ATTR_POSITION]
-                if position > 85:
-                    _LOGGER.debug("async_set_cover_position: opening cover")
-                    await self._async_move_blind_to_step(LIFT_POS_OPEN)
-                elif position < 15:
-                    _LOGGER.debug("async_set_cover_position: closing cover")
-                    await self._async_move_blind_to_step(LIFT_POS_CLOSED)
-                else:
-                    _LOGGER.debug("async_set_cover_position: closing cover to PARTIAL")
-                    await self._async_move_blind_to_step(LIFT_POS_MID)
-        else:
-            _LOGGER.debug("async_set_cover_position: cover is in motion - ignoring")
+        if ATTR_POSITION in kwargs:
+            position = kwargs[ATTR_POSITION]
+            if position >= 100 - POSITION_END_MARGIN:
+                _LOGGER.debug("async_set_cover_position: opening cover")
+                await self._async_run_coalesced_movement(self._async_move_blind_to_step, LIFT_POS_OPEN)
+            elif position <= POSITION_END_MARGIN:
+                _LOGGER.debug("async_set_cover_position: closing cover")
+                await self._async_run_coalesced_movement(self._async_move_blind_to_step, LIFT_POS_CLOSED)
+            else:
+                _LOGGER.debug("async_set_cover_position: moving cover to " + str(position))
+                await self._async_run_coalesced_movement(self._async_move_blind_to_position, position)
 
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Toggle the entity."""
-        if self._is_moving:
-            _LOGGER.debug("async_toggle: cover is in motion - ignoring")
+        if self._myattr_lift_step == LIFT_POS_OPEN:
+            await self.async_close_cover(**kwargs)
         else:
-            if self._myattr_lift_step == LIFT_POS_OPEN:
-                await self.async_close_cover(**kwargs)
-            else:
-                await self.async_open_cover(**kwargs)
+            await self.async_open_cover(**kwargs)
 
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Move the cover up."""
-        if not(self._is_moving):
-            _LOGGER.debug("async_open_cover: RAISING cover")
-            await self._async_move_blind_to_step(LIFT_POS_OPEN)
-        else:
-            _LOGGER.debug("async_open_cover: cover is in motion - ignoring")
+        _LOGGER.debug("async_open_cover: RAISING cover")
+        await self._async_run_movement(self._async_move_blind_to_step, LIFT_POS_OPEN)
 
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Move the cover down."""
-        if not(self._is_moving):
-            if self._myattr_close_to_mid:
-                _LOGGER.debug("async_close_cover: closing cover to PARTIAL")
-                await self._async_move_blind_to_step(LIFT_POS_MID)
-            else:
-                _LOGGER.debug("async_close_cover: closing cover to CLOSED")
-                await self._async_move_blind_to_step(LIFT_POS_CLOSED)
+        if self._myattr_close_to_mid:
+            _LOGGER.debug("async_close_cover: closing cover to PARTIAL")
+            await self._async_run_movement(self._async_move_blind_to_step, LIFT_POS_MID)
         else:
-            _LOGGER.debug("async_close_cover: cover is in motion - ignoring")
+            _LOGGER.debug("async_close_cover: closing cover to CLOSED")
+            await self._async_run_movement(self._async_move_blind_to_step, LIFT_POS_CLOSED)
 
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover."""
-        if not(self._is_moving):
+        # Also drop any request still waiting to be planned
+        self._myattr_requests += 1
+
+        if not(self._is_moving) and not(self._is_movement_running):
             _LOGGER.debug("async_stop_cover: cover is not in motion - ignoring")
         else:
             _LOGGER.debug("async_stop_cover: stopping cover")
-            self._attr_is_closing = False
-            self._attr_is_open = False
-            self.async_write_ha_state()
-
-            await self._async_stop_blind()
+            await self._async_run_movement(self._async_halt)
 
 
     async def async_update_cover_position(self, **kwargs) -> None:
@@ -231,29 +249,59 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
 
     def _set_position(self, step) -> None:
         if step < LIFT_POS_CLOSED:       
-            self._myattr_lift_step = LIFT_POS_CLOSED
+            step = LIFT_POS_CLOSED
         elif step >= LIFT_POS_OPEN:       
-            self._myattr_lift_step = LIFT_POS_OPEN
-        else:       
-            self._myattr_lift_step = step
+            step = LIFT_POS_OPEN
+
+        self._set_lift_position(self._steps_to_pos(step))
+
+
+    def _set_lift_position(self, position) -> None:
+        self._myattr_position = min(max(position, 0), 100)
+        self._myattr_travel = None
+        self._myattr_travel_stop = None
+        self._myattr_move_end = None
 
         """Translate my lift position to HA position
         None is unknown, 0 is closed, 100 is fully open."""
 
-        if self._myattr_lift_step == LIFT_POS_CLOSED:
+        self._attr_current_cover_position = int(round(self._myattr_position))
+        if self._attr_current_cover_position == 0:
+            self._myattr_lift_step = LIFT_POS_CLOSED
             self._attr_is_closed = True
-            self._attr_current_cover_position = 0
-        elif self._myattr_lift_step == LIFT_POS_MID:
-            self._attr_is_closed = self._myattr_partial_is_closed
-            self._attr_current_cover_position = 50
-        else:
+        elif self._attr_current_cover_position == 100:
+            self._myattr_lift_step = LIFT_POS_OPEN
             self._attr_is_closed = False
-            self._attr_current_cover_position = 100
+        else:
+            self._myattr_lift_step = LIFT_POS_MID
+            self._attr_is_closed = self._myattr_partial_is_closed
 
         self._attr_is_opening = False
         self._attr_is_closing = False
 
-        _LOGGER.debug("_set_position; set new position - closed = " + str(self._attr_is_closed) + " pos = " + str(self._attr_current_cover_position))
+        _LOGGER.debug("_set_lift_position; set new position - closed = " + str(self._attr_is_closed) + " pos = " + str(self._myattr_position))
+
+
+    def _travel_secs(self, start_pos, end_pos) -> float:
+        """Return the time to travel between two positions."""
+        if end_pos > start_pos:
+            return (end_pos - start_pos) / 100 * self._myattr_open_secs
+        return (start_pos - end_pos) / 100 * self._myattr_close_secs
+
+
+    def _interpolated_position(self, travel, now) -> float:
+        """Return the position reached at a time during a travel."""
+        start_time, start_pos, direction = travel
+        secs = self._myattr_open_secs if direction > 0 else self._myattr_close_secs
+        position = start_pos + direction * (now - start_time) / secs * 100
+        return min(max(position, 0), 100)
+
+
+    def _current_position(self) -> float:
+        """Return the estimated position, following the current travel."""
+        if self._myattr_travel is not None:
+            return self._interpolated_position(self._myattr_travel, time.monotonic())
+        return self._myattr_position
 
 
     async def _async_wait_and_set_position(self, delay, step) -> None:
@@ -268,6 +316,7 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
                 self._attr_is_closing = True
             else:
                 self._attr_is_opening = True
+            self._myattr_move_end = (time.monotonic() + delay * (1 - MOVE_PADDING_SHARE), self._steps_to_pos(step))
             self.async_write_ha_state()
 
             await asyncio.sleep(delay)
@@ -294,11 +343,47 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
         await self._async_move_blind_to_step(LIFT_POS_CLOSED)
 
 
-    async def _async_stop_blind(self) -> None:
+    async def _async_stop_blind(self) -> TransmitTiming:
         """Stop the cover."""
         _LOGGER.info("Invoked _async_stop_blind")
     
-        await self._async_send(self._device.send_stop)
+        return await self._async_send(self._device.send_stop)
+
+
+    async def _async_halt(self) -> None:
+        """Stop the motor if it is moving, keeping the position reached.
+
+        A move to an end stop or the my position past its travel time is
+        left to finish and its position is set. A travel whose stop is
+        already with the transmitter is left to that stop.
+        """
+        if (stop := self._myattr_travel_stop) is not None:
+            _LOGGER.debug("_async_halt: travel already ending")
+            travel = self._myattr_travel
+            end = await asyncio.shield(stop)
+            self._set_lift_position(self._interpolated_position(travel, end.written))
+            self.async_write_ha_state()
+            return
+
+        if not(self._is_moving):
+            return
+
+        move_end = self._myattr_move_end
+        if move_end is not None and time.monotonic() >= move_end[0]:
+            _LOGGER.debug("_async_halt: interrupted movement has finished")
+            self._set_lift_position(move_end[1])
+            self.async_write_ha_state()
+            return
+
+        _LOGGER.debug("_async_halt: stopping cover")
+        travel = self._myattr_travel
+        self._set_lift_position(self._current_position())
+        self.async_write_ha_state()
+
+        end = await self._async_stop_blind()
+        if travel is not None:
+            self._set_lift_position(self._interpolated_position(travel, end.written))
+            self.async_write_ha_state()
 
 
     async def _async_move_blind_to_step(self, step) -> None:
@@ -306,15 +391,17 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
         _LOGGER.info("Invoked _async_move_blind_to_step; step = " + str(step))
 
         if step == LIFT_POS_OPEN:
-            self._attr_is_opening = True
-            self._attr_current_cover_position = 50
-            self.async_write_ha_state()
-
             _LOGGER.debug("_async_move_blind_to_step; sending UP and waiting")
-            await self._async_send(self._device.send_up05sec)
-            await self._async_wait_and_set_position(self._myattr_open_secs, LIFT_POS_OPEN)
+            travel, _ = await self._async_start_travel(100)
+            self._set_move_end(travel, 100)
+            await self._async_wait_until(await self._async_follow_travel(travel, 100))
+            self._set_lift_position(100)
+            self.async_write_ha_state()
 
         elif step == LIFT_POS_MID:
+            # A stop while moving would stop rather than go to the my position
+            await self._async_halt()
+
             self._attr_is_closing = self._myattr_partial_is_closed
             self._attr_is_opening = not(self._myattr_partial_is_closed)
             self._attr_current_cover_position = 50
@@ -325,22 +412,104 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
             await self._async_wait_and_set_position(self._myattr_open_secs, LIFT_POS_MID)
 
         elif step == LIFT_POS_CLOSED:
-            self._attr_is_closing = True
-            self._attr_current_cover_position = 50
+            _LOGGER.debug("_async_move_blind_to_step; sending DOWN and waiting")
+            travel, _ = await self._async_start_travel(0)
+            self._set_move_end(travel, 0)
+            await self._async_wait_until(await self._async_follow_travel(travel, 0))
+            self._set_lift_position(0)
             self.async_write_ha_state()
 
-            _LOGGER.debug("_async_move_blind_to_step; sending DOWN and waiting")
-            await self._async_send(self._device.send_down05sec)
-            await self._async_wait_and_set_position(self._myattr_close_secs, LIFT_POS_CLOSED)
+
+    async def _async_move_blind_to_position(self, position) -> None:
+        """Move the cover to any position by timing its travel."""
+        _LOGGER.info("Invoked _async_move_blind_to_position; position = " + str(position))
+
+        if abs(position - self._current_position()) < POSITION_END_MARGIN:
+            _LOGGER.debug("_async_move_blind_to_position; already at position")
+            await self._async_halt()
+            return
+
+        # This travel is ended by a stop, so it is stopped when interrupted
+        travel, start = await self._async_start_travel(position)
+        self._myattr_move_end = None
+        due = await self._async_follow_travel(travel, position)
+
+        # Sent from the transmit thread at the due time, away from loop jitter
+        stop = self._myattr_travel_stop = await self._async_queue_at(due, self._device.send_stop)
+        end = await asyncio.shield(stop)
+        if start is not None:
+            self._async_record_pulse("travel", due - start.written, start, end)
+
+        # The position reached depends on when the stop was actually sent
+        self._set_lift_position(self._interpolated_position(travel, end.written))
+        self.async_write_ha_state()
+
+
+    async def _async_start_travel(self, position):
+        """Start travelling towards a position.
+
+        A travel in the same direction is retargeted unless its stop is
+        already with the transmitter, anything else is stopped first. Returns the travel and the timing of the command
+        starting it, None if retargeted.
+        """
+        direction = 1 if position > self._current_position() else -1
+        travel = self._myattr_travel
+        if travel is not None and travel[2] == direction and self._is_moving and self._myattr_travel_stop is None:
+            _LOGGER.debug("_async_start_travel: retargeting travel to " + str(position))
+            return travel, None
+
+        await self._async_halt()
+
+        self._attr_is_opening = direction > 0
+        self._attr_is_closing = direction < 0
+        self.async_write_ha_state()
+
+        # Track the travel from now in case the movement is cancelled while sending
+        self._myattr_travel = (time.monotonic(), self._myattr_position, direction)
+        if direction > 0:
+            start = await self._async_send(self._device.send_up05sec)
+        else:
+            start = await self._async_send(self._device.send_down05sec)
+        travel = self._myattr_travel = (start.written, self._myattr_position, direction)
+        return travel, start
+
+
+    def _set_move_end(self, travel, position) -> None:
+        """Set when a travel ending at an end stop should have stopped."""
+        start_time, start_pos, _ = travel
+        travel_secs = self._travel_secs(start_pos, position)
+        self._myattr_move_end = (start_time + travel_secs * (1 - MOVE_PADDING_SHARE), position)
+
+
+    async def _async_follow_travel(self, travel, position) -> float:
+        """Update the estimated position until a travel almost reaches a position.
+
+        Returns the time the position is due, up to POSITION_UPDATE_SECS
+        later.
+        """
+        start_time, start_pos, _ = travel
+        due = start_time + self._travel_secs(start_pos, position)
+
+        while due - time.monotonic() > POSITION_UPDATE_SECS:
+            await asyncio.sleep(POSITION_UPDATE_SECS)
+            self._attr_current_cover_position = int(round(self._interpolated_position(travel, time.monotonic())))
+            self.async_write_ha_state()
+
+        return due
+
+
+    async def _async_wait_until(self, due) -> None:
+        if (delay := due - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
 
 
-    async def _async_send(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> None:
+    async def _async_send(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> TransmitTiming:
         """Send a command to the motor."""
         _LOGGER.info("Invoked _async_send; command = " + fun.__name__)
-        await super()._async_send(fun, *args)
+        return await super()._async_send(fun, *args)
 
 
-    async def _async_send_repeat(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> None:
+    async def _async_send_repeat(self, fun: Callable[[rfxtrxmod.PySerialTransport, *_Ts], None], *args: *_Ts) -> TransmitTiming:
         """Repeating send a command to the motor."""
         _LOGGER.info("Invoked _async_send_repeat; command = " + fun.__name__)
 
@@ -348,4 +517,4 @@ class SomfyRollerBlind(RfxtrxCommandEntity, CoverEntity):
             for _ in range(self._myattr_repetitions - 1):
                 await self._async_send(fun, *args)
                 await asyncio.sleep(self._myattr_repetition_delay)
-        await self._async_send(fun, *args)
+        return await self._async_send(fun, *args)
@@ -1,13 +1,18 @@
 """Support for RFXtrx covers."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import time
 from typing import Any
-import asyncio
 
 import RFXtrx as rfxtrxmod
 
+from homeassistant.components.cover import ATTR_TILT_POSITION
+
 from .. import DeviceTuple
+from ..transmit import TransmitTiming
 
 from .abs_tilting_cover import (
     AbstractTiltingCover,
@@ -15,6 +20,21 @@ from .abs_tilting_cover import (
     TILT_MID_STEP,
     TILT_MIN_STEP
 )
+from .const import (
+    CONF_GROUP_MEMBERS,
+    CONF_TILT_CALIBRATION,
+    DEF_GROUP_MEMBERS,
+    DEF_TILT_CALIBRATION
+)
+from .somfy_group_planner import (
+    get_group_planner,
+    parse_group_members
+)
+from .tilt_calibration import TiltCalibration
+from .tilt_planner import (
+    TiltAction,
+    plan_tilt
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +42,15 @@ ICON_PATH = "/hacsfiles/rfxtrx-stateful-blinds-icons/icons/venetian"
 
 DEVICE_TYPE = "Somfy Venetian"
 
+# Tilt pulses allowed before the estimated tilt is resynchronised
+MAX_TILT_PULSES = 4
+
+# Extra length of a pulse closing the tilt, so it always reaches the end stop
+TILT_END_MARGIN_SECS = 0.3
+
+TILT_ACTION_LOWER = "lower"
+TILT_ACTION_MY = "my"
+
 # Event 071a000001010101 Office
 # Event 071a000001020101 Front
 # Event 071a000001030101 Back
@@ -54,6 +83,61 @@ class SomfyVenetianBlind(AbstractTiltingCover):
             event=event
         )
 
+        self._myattr_group_members = parse_group_members(entity_info.get(CONF_GROUP_MEMBERS, DEF_GROUP_MEMBERS))
+        self._myattr_tilt_calibration = TiltCalibration.from_config(
+            entity_info.get(CONF_TILT_CALIBRATION, DEF_TILT_CALIBRATION),
+            self._myattr_tilt_pos1_secs,
+            self._myattr_tilt_pos2_secs
+        )
+
+        # Estimated tilt percentage while the blind is lowered
+        self._myattr_tilt = 0.0
+
+        # False once a movement to a known tilt was interrupted
+        self._myattr_tilt_synced = True
+
+        # Start time, start tilt and signed length of the tilt pulse being sent
+        self._myattr_tilt_pulse = None
+
+        # The stop ending the tilt pulse, once it is with the transmitter
+        self._myattr_tilt_stop = None
+
+        # Tilt pulses since the tilt was last known
+        self._myattr_tilt_pulses = 0
+
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the tilt and register with the Somfy group planner."""
+        await super().async_added_to_hass()
+
+        if self._event is None and not(self._myattr_is_raised):
+            old_state = await self.async_get_last_state()
+            if old_state is not None and old_state.attributes.get('current_tilt_position') is not None:
+                self._set_tilt_position(old_state.attributes['current_tilt_position'])
+
+        self._planner = get_group_planner(self.hass)
+        self.async_on_remove(self._planner.async_register(self, self._myattr_group_members))
+
+
+    async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
+        """Move the cover tilt to a specific position."""
+        if ATTR_TILT_POSITION in kwargs:
+            tilt = kwargs[ATTR_TILT_POSITION]
+            tilt_step = self._tilt_to_steps(tilt)
+
+            # Whole steps may be planned together with the rest of a Somfy group
+            if tilt == self._steps_to_tilt(tilt_step):
+                await super().async_set_cover_tilt_position(**kwargs)
+            else:
+                _LOGGER.debug("async_set_cover_tilt_position: setting tilt " + str(tilt))
+                await self._async_run_coalesced_movement(self._async_move_tilt_to_position, tilt)
+
+
+    @property
+    def somfy_id(self) -> str:
+        """Return the Somfy id of the channel, e.g. 010601:1."""
+        return self._device.id_string
+
 
     @property
     def _entity_picture(self) -> str | None:
@@ -101,14 +185,45 @@ class SomfyVenetianBlind(AbstractTiltingCover):
         _LOGGER.info("Invoked _async_lower_blind")
 
         sync_time = self._myattr_sync_secs if not(self._myattr_is_raised) else self._myattr_close_secs
+
+        # Moving from the first frame, so an interruption sends a stop
+        self._set_moving(False, TILT_MIN_STEP)
+        self.async_write_ha_state()
+
         await self._async_send_repeat(self._device.send_down05sec)
         await self._async_wait_and_set_position(sync_time, False, 0)
 
 
-    async def _async_stop_blind(self) -> None:
+    async def _async_stop_blind(self) -> TransmitTiming:
         """Stop the cover."""
         _LOGGER.info("Invoked _async_stop_blind")
-        await self._async_send(self._device.send_stop)
+        return await self._async_send(self._device.send_stop)
+
+
+    async def _async_halt(self) -> None:
+        """Stop the motor if it is moving, estimating the tilt of a cut short pulse."""
+        pulse = self._myattr_tilt_pulse
+        if pulse is None:
+            if self._is_moving:
+                self._myattr_tilt_synced = False
+            await super()._async_halt()
+            return
+
+        start, from_tilt, pulse_secs = pulse
+        if (stop := self._myattr_tilt_stop) is not None:
+            # The stop ending the pulse is already with the transmitter
+            _LOGGER.debug("_async_halt: tilt pulse already ending")
+            end = await asyncio.shield(stop)
+        else:
+            elapsed = time.monotonic() - start
+            _LOGGER.debug("_async_halt: stopping tilt pulse after " + str(elapsed))
+            self._set_tilt_position(self._myattr_tilt_calibration.tilt_after(from_tilt, math.copysign(elapsed, pulse_secs)))
+            self.async_write_ha_state()
+
+            end = await self._async_stop_blind()
+        self._set_tilt_position(self._myattr_tilt_calibration.tilt_after(from_tilt, math.copysign(end.written - start, pulse_secs)))
+        self._myattr_tilt_pulses += 1
+        self.async_write_ha_state()
 
 
     async def _async_tilt_blind_to_step(self, tilt_step) -> None:
@@ -119,39 +234,154 @@ class SomfyVenetianBlind(AbstractTiltingCover):
         if tilt_step >= TILT_MAX_STEP:
             tilt_step = TILT_MIN_STEP
 
-        if tilt_step == TILT_MIN_STEP:
-            _LOGGER.debug("_async_tilt_blind_to_step; tilting to CLOSED and waiting")
-            await self._async_lower_blind()
-        else:
-            # Move to mid point if not already there or if we've been told to go there
-            if tilt_step == TILT_MID_STEP or self._myattr_tilt_step != TILT_MID_STEP:
-                sync_time = self._myattr_sync_secs if not(self._myattr_is_raised) else self._myattr_close_secs
+        await self._planner.async_tilt(self, tilt_step)
 
-                _LOGGER.debug("_async_tilt_blind_to_step; tilting to MID and waiting " + str(sync_time))
-                await self._async_send(self._device.send_stop)
-                await self._async_wait_and_set_position(sync_time, False, tilt_step)
 
-            if tilt_step == 1:
-                self._attr_is_closing = self._myattr_partial_is_closed
-                self._attr_is_opening = not(self._myattr_partial_is_closed)
-                self.async_write_ha_state()
+    async def _async_move_group_to_step(self, tilt_step) -> None:
+        """Move this group channel, and so every blind in it, to a preset position."""
+        _LOGGER.info("Invoked _async_move_group_to_step; tilt_step = " + str(tilt_step))
 
-                _LOGGER.debug("_async_tilt_blind_to_step; tilting DOWN and waiting " + str(self._myattr_tilt_pos1_secs))
-                await self._async_send(self._device.send_down05sec)
-                await asyncio.sleep(self._myattr_tilt_pos1_secs)
+        # The members may be at different tilts so start from a known tilt
+        await self._async_move_tilt_to_step(tilt_step, resync=True)
 
-                await self._async_send(self._device.send_stop)
-                self._set_position(False, tilt_step)
-                self.async_write_ha_state()
-            elif tilt_step == 3:
-                self._attr_is_closing = self._myattr_partial_is_closed
-                self._attr_is_opening = not(self._myattr_partial_is_closed)
-                self.async_write_ha_state()
 
-                _LOGGER.debug("_async_tilt_blind_to_step; tilting UP and waiting " + str(self._myattr_tilt_pos2_secs))
-                await self._async_send(self._device.send_up05sec)
-                await asyncio.sleep(self._myattr_tilt_pos2_secs)
+    async def _async_follow_group_move(self, group, tilt_step, task) -> None:
+        """Wait for a move of a group channel this blind is a member of.
+
+        The state reached by the group is only taken if this blind was not
+        given a newer request in the meantime, which cancels this wait.
+        """
+        self._set_moving(False, tilt_step)
+        self.async_write_ha_state()
 
-                await self._async_send(self._device.send_stop)
-                self._set_position(False, tilt_step)
+        try:
+            # Several blinds wait on the same group move, so do not let one cancel it
+            await asyncio.shield(task)
+        finally:
+            if task.done():
+                if group._myattr_is_raised:
+                    self._set_position(True, group._myattr_tilt_step)
+                else:
+                    self._set_tilt_position(group._myattr_tilt)
+                    self._myattr_tilt_synced = group._myattr_tilt_synced
+                    self._myattr_tilt_pulses = group._myattr_tilt_pulses
                 self.async_write_ha_state()
+
+
+    async def _async_move_tilt_to_step(self, tilt_step, resync=False) -> None:
+        """Send the commands to move the cover tilt to a preset position."""
+        await self._async_move_tilt_to_position(self._steps_to_tilt(tilt_step), resync)
+
+
+    async def _async_move_tilt_to_position(self, tilt, resync=False) -> None:
+        """Send the cheapest sequence of commands moving the cover tilt to any position.
+
+        The blind may first be lowered or sent to the my position, which
+        both reach a known tilt, and then pulsed up or down from there or
+        from the estimated tilt.
+        """
+        tilt = min(max(tilt, 0), self._myattr_tilt_calibration.max_tilt)
+
+        known_tilt = self._myattr_tilt
+        if resync or self._myattr_is_raised or not(self._myattr_tilt_synced) or self._myattr_tilt_pulses >= MAX_TILT_PULSES:
+            known_tilt = None
+
+        plan = plan_tilt(known_tilt, tilt, self._tilt_actions(), self._tilt_pulse_secs)
+        _LOGGER.debug("_async_move_tilt_to_position; planned " + str(plan) + " from " + str(known_tilt) + " to " + str(tilt))
+
+        if plan.action is not None:
+            if plan.action.name == TILT_ACTION_LOWER:
+                _LOGGER.debug("_async_move_tilt_to_position; tilting to CLOSED and waiting")
+                await self._async_lower_blind()
+            else:
+                _LOGGER.debug("_async_move_tilt_to_position; tilting to MID and waiting")
+                await self._async_tilt_blind_to_mid()
+
+            if self._myattr_is_raised or self._myattr_tilt != plan.action.tilt:
+                _LOGGER.debug("_async_move_tilt_to_position; interrupted before reaching " + plan.action.name)
+                return
+
+        if plan.pulse:
+            await self._async_send_tilt_pulse(plan.pulse, tilt)
+        elif plan.action is None:
+            _LOGGER.debug("_async_move_tilt_to_position; already at tilt " + str(self._myattr_tilt))
+
+
+    def _tilt_actions(self) -> list[TiltAction]:
+        """Return the actions reaching a known tilt from the current state."""
+        secs = self._myattr_sync_secs if not(self._myattr_is_raised) else self._myattr_close_secs
+        return [
+            TiltAction(TILT_ACTION_LOWER, 0, secs, self._myattr_repetitions),
+            TiltAction(TILT_ACTION_MY, self._steps_to_tilt(TILT_MID_STEP), secs, 1),
+        ]
+
+
+    def _tilt_pulse_secs(self, from_tilt, to_tilt) -> float:
+        """Return the pulse between two tilts, negative for down."""
+        pulse = self._myattr_tilt_calibration.pulse(from_tilt, to_tilt)
+        if to_tilt <= 0 and pulse < 0:
+            pulse -= TILT_END_MARGIN_SECS
+        return pulse
+
+
+    async def _async_tilt_blind_to_mid(self) -> None:
+        """Send the blind to the my position."""
+        sync_time = self._myattr_sync_secs if not(self._myattr_is_raised) else self._myattr_close_secs
+
+        self._set_moving(False, TILT_MID_STEP)
+        self.async_write_ha_state()
+
+        await self._async_send(self._device.send_stop)
+        await self._async_wait_and_set_position(sync_time, False, TILT_MID_STEP)
+
+
+    async def _async_send_tilt_pulse(self, pulse, tilt) -> None:
+        """Tilt the blind up or down for a time, towards a tilt."""
+        self._attr_is_opening = pulse > 0
+        self._attr_is_closing = pulse < 0
+        self.async_write_ha_state()
+
+        # Track the pulse from now in case the movement is cancelled while sending
+        from_tilt = self._myattr_tilt
+        self._myattr_tilt_pulse = (time.monotonic(), from_tilt, pulse)
+
+        _LOGGER.debug("_async_send_tilt_pulse; tilting from " + str(from_tilt) + " to " + str(tilt) + " with pulse " + str(pulse))
+        if pulse > 0:
+            start = await self._async_send(self._device.send_up05sec)
+        else:
+            start = await self._async_send(self._device.send_down05sec)
+        self._myattr_tilt_pulse = (start.written, from_tilt, pulse)
+
+        # Sent from the transmit thread at the due time, away from loop jitter
+        stop = self._myattr_tilt_stop = await self._async_queue_at(start.written + abs(pulse), self._device.send_stop)
+        end = await asyncio.shield(stop)
+        self._async_record_pulse("tilt", abs(pulse), start, end)
+
+        if tilt <= 0:
+            # Pulsed against the end stop so the tilt is known again
+            self._set_position(False, TILT_MIN_STEP)
+        else:
+            # Estimate the tilt from the pulse the motor actually received
+            achieved = end.written - start.written
+            self._set_tilt_position(self._myattr_tilt_calibration.tilt_after(from_tilt, math.copysign(achieved, pulse)))
+            self._myattr_tilt_pulses += 1
+        self.async_write_ha_state()
+
+
+    def _set_position(self, is_raised, tilt_step) -> None:
+        super()._set_position(is_raised, tilt_step)
+        self._myattr_tilt = self._attr_current_cover_tilt_position
+        self._myattr_tilt_synced = True
+        self._myattr_tilt_pulse = None
+        self._myattr_tilt_stop = None
+        self._myattr_tilt_pulses = 0
+
+
+    def _set_tilt_position(self, tilt) -> None:
+        """Set the blind as lowered at an estimated tilt."""
+        tilt = min(max(tilt, 0), 100)
+        pulses = self._myattr_tilt_pulses
+        self._set_position(False, min(self._tilt_to_steps(tilt), TILT_MAX_STEP - 1))
+        self._myattr_tilt = tilt
+        self._myattr_tilt_pulses = pulses
+        self._attr_current_cover_tilt_position = int(round(tilt))
@@ -0,0 +1,108 @@
+"""Calibrated tilt model for RFXtrx venetian blinds."""
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pulses shorter than this are not sent as the motor would not move reliably
+MIN_TILT_PULSE_SECS = 0.1
+
+
+def parse_tilt_calibration(calibration) -> list[tuple[float, float]]:
+    """Return the (secs, tilt) points from a list like "0:0, 900:25, 1750:50".
+
+    Each point is the length in ms of an up pulse from fully tilted closed
+    and the tilt percentage it reaches.
+    """
+    if not calibration:
+        return []
+
+    points = []
+    for point in calibration.split(","):
+        if not point.strip():
+            continue
+        pulse_ms, tilt = point.split(":")
+        points.append((float(pulse_ms) / 1000, float(tilt)))
+
+    if len(points) < 2:
+        raise ValueError("at least two points are needed")
+    for (secs1, tilt1), (secs2, tilt2) in zip(points, points[1:]):
+        if secs2 <= secs1 or tilt2 <= tilt1:
+            raise ValueError("pulses and tilts must both increase")
+    return points
+
+
+class TiltCalibration:
+    """Tilt of a blind as a piecewise linear function of pulse length.
+
+    The points map the length of an up pulse from fully tilted closed to
+    the tilt it reaches. A pulse between two tilts is the difference of
+    their lengths, whichever the direction.
+    """
+
+    def __init__(self, points: list[tuple[float, float]]) -> None:
+        self._secs = [secs - points[0][0] for secs, _ in points]
+        self._tilts = [tilt for _, tilt in points]
+
+
+    @classmethod
+    def from_config(cls, calibration, tilt1_secs, tilt2_secs) -> TiltCalibration:
+        """Return the configured calibration or one from the tilt times.
+
+        Without a configured calibration the lower and upper tilt times,
+        the pulses from the mid point to 25% and 75%, are assumed to hold
+        below and above the mid point.
+        """
+        try:
+            points = parse_tilt_calibration(calibration)
+        except ValueError as err:
+            _LOGGER.warning("Invalid tilt calibration '" + str(calibration) + "': " + str(err) + ", using the tilt times")
+            points = []
+
+        if not points:
+            points = [
+                (0, 0),
+                (tilt1_secs, 25),
+                (2 * tilt1_secs, 50),
+                (2 * tilt1_secs + tilt2_secs, 75),
+                (2 * tilt1_secs + 2 * tilt2_secs, 100),
+            ]
+        return cls(points)
+
+
+    @property
+    def max_tilt(self) -> float:
+        """Return the highest calibrated tilt."""
+        return self._tilts[-1]
+
+
+    def pulse(self, from_tilt, to_tilt) -> float:
+        """Return the pulse in secs between two tilts, negative for down."""
+        return self._secs_at(to_tilt) - self._secs_at(from_tilt)
+
+
+    def tilt_after(self, from_tilt, pulse_secs) -> float:
+        """Return the tilt reached by a pulse, negative for down, from a tilt."""
+        return self._tilt_at(self._secs_at(from_tilt) + pulse_secs)
+
+
+    def _secs_at(self, tilt) -> float:
+        return self._interpolate(tilt, self._tilts, self._secs)
+
+
+    def _tilt_at(self, secs) -> float:
+        return self._interpolate(secs, self._secs, self._tilts)
+
+
+    @staticmethod
+    def _interpolate(value, xs, ys) -> float:
+        if value <= xs[0]:
+            return ys[0]
+        if value >= xs[-1]:
+            return ys[-1]
+        index = bisect_left(xs, value)
+        x1, x2 = xs[index - 1], xs[index]
+        y1, y2 = ys[index - 1], ys[index]
+        return y1 + (value - x1) * (y2 - y1) / (x2 - x1)
@@ -0,0 +1,67 @@
+"""Plan the cheapest way to tilt an RFXtrx venetian blind."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import NamedTuple
+
+from .tilt_calibration import MIN_TILT_PULSE_SECS
+
+# Cost of sending one frame in seconds of motion, for airtime and motor wear
+FRAME_COST_SECS = 0.25
+
+# A pulse is a start command and a stop command
+PULSE_FRAMES = 2
+
+# Cost of each second of a pulse too short to send, for ending off target
+MISSED_PULSE_COST = 10
+
+
+class TiltAction(NamedTuple):
+    """A command taking the blind to a known tilt from any state.
+
+    For example a full close or the "my" position. The time and frames
+    are estimates for the current state of the blind.
+    """
+
+    name: str
+    tilt: float
+    secs: float
+    frames: int
+
+
+class TiltPlan(NamedTuple):
+    """An optional action followed by an optional pulse, with its cost."""
+
+    action: TiltAction | None
+    pulse: float
+    cost: float
+
+
+def plan_tilt(tilt, target, actions, pulse_secs: Callable[[float, float], float]) -> TiltPlan:
+    """Return the cheapest plan moving the tilt to a target.
+
+    The tilt is None when it is not known, so the plan has to start with
+    an action. Otherwise the target may be reached by a pulse alone, worked
+    out by pulse_secs from one tilt to another, negative for down. Longer
+    sequences are never needed as every action reaches a known tilt.
+    """
+    plans = []
+    if tilt is not None:
+        plans.append(_plan(None, tilt, target, pulse_secs))
+    for action in actions:
+        plans.append(_plan(action, action.tilt, target, pulse_secs))
+    return min(plans, key=lambda plan: plan.cost)
+
+
+def _plan(action, tilt, target, pulse_secs) -> TiltPlan:
+    pulse = pulse_secs(tilt, target)
+
+    cost = 0.0
+    if action is not None:
+        cost += action.secs + action.frames * FRAME_COST_SECS
+    if abs(pulse) < MIN_TILT_PULSE_SECS:
+        cost += abs(pulse) * MISSED_PULSE_COST
+        pulse = 0.0
+    else:
+        cost += abs(pulse) + PULSE_FRAMES * FRAME_COST_SECS
+    return TiltPlan(action, pulse, cost)
@@ -0,0 +1,213 @@
+"""Latency metrics for the RFXtrx integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .transmit import TransmitTiming
+
+# Upper bounds of the histogram buckets in seconds
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+class LatencyHistogram:
+    """Histogram of durations in fixed buckets."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, duration: float) -> None:
+        """Record a duration in seconds."""
+        self.buckets[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                break
+        if index < len(LATENCY_BUCKETS):
+            return LATENCY_BUCKETS[index]
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram with durations in milliseconds."""
+        bounds = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS]
+        bounds.append(f">{LATENCY_BUCKETS[-1] * 1000:g}ms")
+        return {
+            "count": self.count,
+            "average_ms": self.total / self.count * 1000 if self.count else None,
+            "p50_ms": _milliseconds(self.percentile(50)),
+            "p95_ms": _milliseconds(self.percentile(95)),
+            "max_ms": self.max * 1000,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    return None if seconds is None else seconds * 1000
+
+
+class ReceiveMetrics:
+    """Counters and per stage latencies of received frames.
+
+    A frame is timestamped when the reader thread hands it over. The stages
+    are the hand-off to the event loop, the dispatch up to the entities,
+    the entities applying the event and writing their state. The total
+    runs from the reader thread until the last entity has written its
+    state.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.started = time.monotonic()
+        self.frames = 0
+        self.dropped = 0
+        self.deduplicated = 0
+        self.unknown_device = 0
+        self.handoff = LatencyHistogram()
+        self.dispatch = LatencyHistogram()
+        self.apply = LatencyHistogram()
+        self.state_write = LatencyHistogram()
+        self.total = LatencyHistogram()
+        # Set while entities handle a received frame, so only the state
+        # writes it causes are recorded
+        self.receiving = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "frames": self.frames,
+            "frames_per_second": self.frames / elapsed if elapsed > 0 else None,
+            "dropped": self.dropped,
+            "deduplicated": self.deduplicated,
+            "unknown_device": self.unknown_device,
+            "latency": {
+                "handoff": self.handoff.as_dict(),
+                "dispatch": self.dispatch.as_dict(),
+                "apply": self.apply.as_dict(),
+                "state_write": self.state_write.as_dict(),
+                "total": self.total.as_dict(),
+            },
+        }
+
+
+class TransmitMetrics:
+    """Per stage latencies of commands written to the RFXtrx.
+
+    The stages are the wait in the transmit queue, the wait for the
+    transmit thread and the write itself. The total runs from the command
+    being queued until it has been written.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.queue = LatencyHistogram()
+        self.executor = LatencyHistogram()
+        self.write = LatencyHistogram()
+        self.total = LatencyHistogram()
+
+    def record(self, timing: TransmitTiming) -> None:
+        """Record the timing of a written command."""
+        self.queue.record(timing.dispatched - timing.queued)
+        self.executor.record(timing.started - timing.dispatched)
+        self.write.record(timing.written - timing.started)
+        self.total.record(timing.written - timing.queued)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics."""
+        return {
+            "queue": self.queue.as_dict(),
+            "executor": self.executor.as_dict(),
+            "write": self.write.as_dict(),
+            "total": self.total.as_dict(),
+        }
+
+
+class RequestMetrics:
+    """Movement requests to an entity and how many were never planned.
+
+    A request is collapsed when a newer request arrives while it waits
+    out its coalescing window, so only the last of a burst is sent.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.received = 0
+        self.collapsed = 0
+
+    def record(self) -> None:
+        """Record a request."""
+        self.received += 1
+
+    def record_collapsed(self) -> None:
+        """Record a request replaced before it was planned."""
+        self.collapsed += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics."""
+        return {
+            "received": self.received,
+            "collapsed": self.collapsed,
+            "planned": self.received - self.collapsed,
+        }
+
+
+class PulseMetrics:
+    """Achieved width of a pulse between two commands against its configured width."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.configured = 0.0
+        self.achieved = LatencyHistogram()
+        self.total_error = 0.0
+        self.max_error = 0.0
+
+    def record(self, configured: float, achieved: float) -> None:
+        """Record a pulse, both widths in seconds."""
+        self.configured = configured
+        self.achieved.record(achieved)
+        error = achieved - configured
+        self.total_error += error
+        if abs(error) > abs(self.max_error):
+            self.max_error = error
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics in milliseconds."""
+        count = self.achieved.count
+        return {
+            "configured_ms": self.configured * 1000,
+            "achieved": self.achieved.as_dict(),
+            "average_error_ms": self.total_error / count * 1000 if count else None,
+            "max_error_ms": self.max_error * 1000,
+        }
@@ -0,0 +1,115 @@
+"""Transport replaying frames captured from an RFXtrx."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+import logging
+import threading
+import time
+
+import RFXtrx as rfxtrxmod
+
+from .capture import CapturedFrame, Direction, read_capture
+
+_LOGGER = logging.getLogger(__name__)
+
+# Reply to a status request, a 433.92MHz RFXtrx with no protocols enabled
+STATUS_REPLY = b"\x0D\x01\x00\x00\x02\x53\x00\x00\x00\x00\x00\x00\x00\x00"
+
+
+class ReplayTransport(rfxtrxmod.RFXtrxTransport):
+    """Transport receiving the frames of a capture file.
+
+    Received frames are played at their original timing divided by the
+    speed, or as fast as they are taken with a speed of 0. Transmitted
+    frames are dropped. The commands of the handshake with the RFXtrx are
+    answered without consuming captured frames, a status request with a
+    made up status. Once all frames are played the transport stays quiet
+    until closed.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0) -> None:
+        """Initialize the transport."""
+        self.path = path
+        self.speed = speed
+        self.frames = 0
+        self._closed = threading.Event()
+        self._lock = threading.Lock()
+        self._capture: Iterator[CapturedFrame] | None = None
+        self._frames: Iterator[CapturedFrame] | None = None
+        self._replies: deque[rfxtrxmod.RFXtrxEvent | None] = deque()
+        self._replaying = False
+        self._start = 0.0
+        self._first: float | None = None
+
+    def connect(self, timeout: float | None = None) -> None:
+        """Open the capture file."""
+        try:
+            frames = read_capture(self.path)
+            first = next(frames, None)
+        except (OSError, ValueError) as err:
+            raise rfxtrxmod.RFXtrxTransportError(
+                f"Unable to replay {self.path}: {err}"
+            ) from err
+        self._capture = frames
+        self._frames = self._received(first, frames)
+
+    def reset(self) -> None:
+        """Reset nothing."""
+
+    def close(self) -> None:
+        """Stop replaying and close the capture file."""
+        self._closed.set()
+        with self._lock:
+            if self._capture is not None:
+                self._capture.close()
+                self._capture = None
+
+    def send(self, data: bytes | bytearray) -> None:
+        """Drop a frame, answering it while connecting."""
+        if self._replaying:
+            return
+        if len(data) > 4 and data[1] == 0x00 and data[4] == 0x02:
+            self._replies.append(self.parse(bytearray(STATUS_REPLY)))
+        else:
+            self._replies.append(None)
+
+    def receive_blocking(self) -> rfxtrxmod.RFXtrxEvent | None:
+        """Return the next captured frame when it is due."""
+        if self._replies:
+            # Reply to the status and start commands of the handshake
+            return self._replies.popleft()
+        if not self._replaying:
+            self._replaying = True
+            self._start = time.monotonic()
+
+        with self._lock:
+            frame = None
+            if self._capture is not None and self._frames is not None:
+                frame = next(self._frames, None)
+        if self._closed.is_set() or frame is None:
+            if not self._closed.is_set():
+                _LOGGER.info("Replayed %s frames from %s", self.frames, self.path)
+            self._closed.wait()
+            return None
+
+        if self.speed > 0:
+            if self._first is None:
+                self._first = frame.timestamp
+            due = self._start + (frame.timestamp - self._first) / self.speed
+            if (delay := due - time.monotonic()) > 0 and self._closed.wait(delay):
+                return None
+
+        self.frames += 1
+        return self.parse(bytearray(frame.data))
+
+    @staticmethod
+    def _received(
+        first: CapturedFrame | None, frames: Iterator[CapturedFrame]
+    ) -> Iterator[CapturedFrame]:
+        """Return the received frames."""
+        if first is not None and first.direction == Direction.RECEIVED:
+            yield first
+        for frame in frames:
+            if frame.direction == Direction.RECEIVED:
+                yield frame
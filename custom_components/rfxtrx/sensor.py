@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
 import logging
+import time
 from typing import Any, cast
 
 from RFXtrx import ControlEvent, RFXtrxDevice, RFXtrxEvent, SensorEvent
@@ -23,6 +24,7 @@ from homeassistant.const import (
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
     UV_INDEX,
     EntityCategory,
+    Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
@@ -31,6 +33,7 @@ from homeassistant.const import (
     UnitOfPressure,
     UnitOfSpeed,
     UnitOfTemperature,
+    UnitOfTime,
     UnitOfVolumetricFlux,
 )
 from homeassistant.core import HomeAssistant, callback
@@ -39,7 +42,8 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
 from . import DeviceTuple, RfxtrxEntity, async_setup_platform_entry, get_rfx_object
-from .const import ATTR_EVENT
+from .const import ATTR_EVENT, DATA_RECEIVE_METRICS, DOMAIN
+from .metrics import ReceiveMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -238,6 +242,11 @@ SENSOR_TYPES = (
 SENSOR_TYPES_DICT = {desc.key: desc for desc in SENSOR_TYPES}
 
 
+def supported(event: RFXtrxEvent) -> bool:
+    """Return whether an event supports sensor."""
+    return isinstance(event, (ControlEvent, SensorEvent))
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -245,9 +254,6 @@ async def async_setup_entry(
 ) -> None:
     """Set up config entry."""
 
-    def _supported(event: RFXtrxEvent) -> bool:
-        return isinstance(event, (ControlEvent, SensorEvent))
-
     def _constructor(
         event: RFXtrxEvent,
         auto: RFXtrxEvent | None,
@@ -268,7 +274,15 @@ async def async_setup_entry(
         return entities
 
     await async_setup_platform_entry(
-        hass, config_entry, async_add_entities, _supported, _constructor
+        hass, config_entry, async_add_entities, Platform.SENSOR, _constructor
+    )
+
+    async_add_entities(
+        [
+            RfxtrxReceiveLatencySensor(
+                hass.data[DOMAIN][DATA_RECEIVE_METRICS], config_entry.entry_id
+            )
+        ]
     )
 
 
@@ -333,3 +347,54 @@ class RfxtrxSensor(RfxtrxEntity, SensorEntity):
         self._apply_event(event)
 
         self.async_write_ha_state()
+
+
+class RfxtrxReceiveLatencySensor(SensorEntity):
+    """Diagnostic sensor for the latency of received frames.
+
+    The state is the average time from a frame arriving from the RFXtrx
+    until its entities have written their state, over the last update
+    interval.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+    _attr_translation_key = "receive_latency"
+
+    def __init__(self, metrics: ReceiveMetrics, entry_id: str) -> None:
+        """Initialize the sensor."""
+        self._metrics = metrics
+        self._attr_unique_id = f"{entry_id}_receive_latency"
+        self._last_update = time.monotonic()
+        self._last_frames = metrics.frames
+        self._last_count = metrics.total.count
+        self._last_total = metrics.total.total
+
+    async def async_update(self) -> None:
+        """Update the latency and the frame counters."""
+        metrics = self._metrics
+        now = time.monotonic()
+        if count := metrics.total.count - self._last_count:
+            self._attr_native_value = (
+                (metrics.total.total - self._last_total) / count * 1000
+            )
+        else:
+            self._attr_native_value = None
+        self._attr_extra_state_attributes = {
+            "frames_per_second": round(
+                (metrics.frames - self._last_frames) / (now - self._last_update), 3
+            ),
+            "frames": metrics.frames,
+            "dropped": metrics.dropped,
+            "deduplicated": metrics.deduplicated,
+            "unknown_device": metrics.unknown_device,
+        }
+        self._last_update = now
+        self._last_frames = metrics.frames
+        self._last_count = metrics.total.count
+        self._last_total = metrics.total.total
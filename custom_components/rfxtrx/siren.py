@@ -8,6 +8,7 @@ import RFXtrx as rfxtrxmod
 
 from homeassistant.components.siren import ATTR_TONE, SirenEntity, SirenEntityFeature
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
 from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -20,6 +21,7 @@ from . import (
     async_setup_platform_entry,
 )
 from .const import CONF_OFF_DELAY
+from .transmit import TransmitPriority
 
 SECURITY_PANIC_ON = "Panic"
 SECURITY_PANIC_OFF = "End Panic"
@@ -88,7 +90,7 @@ async def async_setup_entry(
         return []
 
     await async_setup_platform_entry(
-        hass, config_entry, async_add_entities, supported, _constructor
+        hass, config_entry, async_add_entities, Platform.SIREN, _constructor
     )
 
 
@@ -189,6 +191,7 @@ class RfxtrxSecurityPanic(RfxtrxCommandEntity, SirenEntity, RfxtrxOffDelayMixin)
 
     _attr_supported_features = SirenEntityFeature.TURN_ON | SirenEntityFeature.TURN_OFF
     _device: rfxtrxmod.SecurityDevice
+    _transmit_priority = TransmitPriority.URGENT
 
     def __init__(
         self,
@@ -0,0 +1,374 @@
+"""Transmit path for RFXtrx commands."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import IntEnum
+import itertools
+import logging
+import time
+from typing import Any, TypeVarTuple
+
+import RFXtrx as rfxtrxmod
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .metrics import PulseMetrics, RequestMetrics, TransmitMetrics
+
+_Ts = TypeVarTuple("_Ts")
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands which are always sent ahead of any other queued traffic
+URGENT_COMMANDS = {"send_stop"}
+
+# Commands held while the connection to the RFXtrx is down
+MAX_BUFFERED_COMMANDS = 64
+
+# Seconds a command is held without a connection before it is dropped
+HELD_COMMAND_TIMEOUT = 30.0
+
+# How long before its time a timed command is handed to the transmit thread
+TIMED_SEND_LEAD = 0.05
+
+
+class TransmitPriority(IntEnum):
+    """Priority lanes of the transmit queue, lowest value first."""
+
+    URGENT = 0
+    NORMAL = 1
+    BULK = 2
+
+
+@dataclass
+class TransmitTiming:
+    """Monotonic times a command passed through the transmit path."""
+
+    queued: float
+    dispatched: float = 0.0
+    started: float = 0.0
+    written: float = 0.0
+
+
+@dataclass(order=True)
+class TransmitJob:
+    """A command waiting to be written to the transport."""
+
+    priority: TransmitPriority
+    sequence: int
+    fun: Callable[..., None] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    future: asyncio.Future[TransmitTiming] = field(compare=False, repr=False)
+    timing: TransmitTiming = field(compare=False)
+    source: str | None = field(compare=False)
+    not_before: float | None = field(compare=False)
+
+
+@dataclass
+class LaneStats:
+    """Statistics of a priority lane."""
+
+    sent: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics."""
+        return {
+            "sent": self.sent,
+            "average_wait": self.total_wait / self.sent if self.sent else None,
+            "max_wait": self.max_wait,
+        }
+
+
+def send_raw(transport: rfxtrxmod.RFXtrxTransport, data: bytes | bytearray) -> None:
+    """Write a raw packet to the transport."""
+    transport.send(data)
+
+
+def _write(
+    timing: TransmitTiming,
+    not_before: float | None,
+    fun: Callable[..., None],
+    transport: rfxtrxmod.RFXtrxTransport,
+    *args: Any,
+) -> None:
+    """Write a command on the transmit thread, recording when it ran.
+
+    A timed command is held on this thread until its time, away from the
+    scheduling jitter of the event loop.
+    """
+    if not_before is not None and (delay := not_before - time.monotonic()) > 0:
+        time.sleep(delay)
+    timing.started = time.monotonic()
+    fun(transport, *args)
+    timing.written = time.monotonic()
+
+
+class RfxtrxTransmitter:
+    """Schedule commands to the RFXtrx on a dedicated worker.
+
+    The RFXtrx can only put one frame on air at a time. Commands are taken
+    from a priority queue, so a stop is never stuck behind bulk traffic,
+    and a configurable gap is kept between consecutive frames. The
+    transport is owned by a single thread, so writes do not compete with
+    the shared executor of Home Assistant.
+
+    While the connection is paused, commands are held in the queue up to
+    a bound and written once it is resumed. A command still held after
+    HELD_COMMAND_TIMEOUT fails, as a late blind or light command is worse
+    than none. Failed and cancelled commands stay in the queue until the
+    worker skips them, so only the commands still waiting count towards
+    the bound.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_transport: Callable[[], rfxtrxmod.RFXtrxTransport],
+        gap: float = 0.0,
+    ) -> None:
+        """Initialize the transmitter with a gap between frames in seconds."""
+        self._hass = hass
+        self._get_transport = get_transport
+        self._gap = gap
+        self._queue: asyncio.PriorityQueue[TransmitJob] = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="rfxtrx_transmit"
+        )
+        self._task: asyncio.Task[None] | None = None
+        self._connected = asyncio.Event()
+        self._connected.set()
+        self._waiting = 0
+        self._lanes = {priority: LaneStats() for priority in TransmitPriority}
+        self.max_queue_depth = 0
+        self.rejected = 0
+        self.expired = 0
+        self._commands: dict[str, TransmitMetrics] = {}
+        self._sources: dict[str, dict[str, TransmitMetrics]] = {}
+        self._pulses: dict[str, dict[str, PulseMetrics]] = {}
+        self._requests: dict[str, RequestMetrics] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of queued commands."""
+        return self._queue.qsize()
+
+    @property
+    def connected(self) -> bool:
+        """Return if commands are being written to the transport."""
+        return self._connected.is_set()
+
+    @callback
+    def async_pause(self) -> None:
+        """Hold commands until the connection is resumed."""
+        self._connected.clear()
+
+    @callback
+    def async_resume(self) -> None:
+        """Write held and new commands to the transport."""
+        self._connected.set()
+
+    @callback
+    def async_start(self) -> None:
+        """Start the transmit worker."""
+        self._task = self._hass.async_create_background_task(
+            self._async_worker(), "rfxtrx transmit"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop the transmit worker and fail commands still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(
+                    rfxtrxmod.RFXtrxTransportError("Transmitter stopped")
+                )
+
+        self._executor.shutdown(wait=False)
+
+    async def async_send(
+        self,
+        fun: Callable[[rfxtrxmod.RFXtrxTransport, *_Ts], None],
+        *args: *_Ts,
+        priority: TransmitPriority = TransmitPriority.NORMAL,
+        source: str | None = None,
+        not_before: float | None = None,
+    ) -> TransmitTiming:
+        """Queue a command and wait until it has been written.
+
+        Timings are recorded per command and, if given, per source such as
+        the entity id sending the command. A command with a monotonic time
+        to write it at should be queued no more than TIMED_SEND_LEAD before
+        that time, as it holds the transmit thread until then.
+        """
+        if not self.connected and self._waiting >= MAX_BUFFERED_COMMANDS:
+            self.rejected += 1
+            raise rfxtrxmod.RFXtrxTransportError(
+                "Not connected and transmit buffer is full"
+            )
+
+        future: asyncio.Future[TransmitTiming] = self._hass.loop.create_future()
+        self._queue.put_nowait(
+            TransmitJob(
+                priority,
+                next(self._sequence),
+                fun,
+                args,
+                future,
+                TransmitTiming(time.monotonic()),
+                source,
+                not_before,
+            )
+        )
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        self._waiting += 1
+
+        expire = self._hass.loop.call_later(
+            HELD_COMMAND_TIMEOUT, self._async_expire, future
+        )
+        future.add_done_callback(lambda _: self._async_job_done(expire))
+        return await future
+
+    @callback
+    def _async_job_done(self, expire: asyncio.TimerHandle) -> None:
+        """Stop counting a command once it is written, failed or cancelled."""
+        expire.cancel()
+        self._waiting -= 1
+
+    @callback
+    def _async_expire(self, future: asyncio.Future[TransmitTiming]) -> None:
+        """Fail a command held for too long without a connection.
+
+        The worker skips the failed command when it reaches it.
+        """
+        if future.done() or self.connected:
+            return
+        self.expired += 1
+        future.set_exception(
+            HomeAssistantError(
+                f"Not connected to the RFXtrx for {HELD_COMMAND_TIMEOUT} s,"
+                " command dropped"
+            )
+        )
+
+    @callback
+    def async_record_pulse(
+        self, source: str, name: str, configured: float, achieved: float
+    ) -> None:
+        """Record the achieved width of a timed pulse against the configured one."""
+        self._pulses.setdefault(source, {}).setdefault(name, PulseMetrics()).record(
+            configured, achieved
+        )
+
+    @callback
+    def async_request_metrics(self, source: str) -> RequestMetrics:
+        """Return the metrics of the movement requests to a source."""
+        return self._requests.setdefault(source, RequestMetrics())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler statistics."""
+        return {
+            "connected": self.connected,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "gap": self._gap,
+            "lanes": {
+                priority.name.lower(): lane.as_dict()
+                for priority, lane in self._lanes.items()
+            },
+            "commands": {
+                name: metrics.as_dict() for name, metrics in self._commands.items()
+            },
+            "sources": {
+                source: {
+                    "commands": {
+                        name: metrics.as_dict()
+                        for name, metrics in self._sources.get(source, {}).items()
+                    },
+                    "pulses": {
+                        name: metrics.as_dict()
+                        for name, metrics in self._pulses.get(source, {}).items()
+                    },
+                    "requests": (
+                        self._requests[source].as_dict()
+                        if source in self._requests
+                        else None
+                    ),
+                }
+                for source in self._sources.keys()
+                | self._pulses.keys()
+                | self._requests.keys()
+            },
+        }
+
+    @callback
+    def _async_record(self, job: TransmitJob) -> None:
+        """Record the timing of a written command."""
+        name = getattr(job.fun, "__name__", "unknown")
+        self._commands.setdefault(name, TransmitMetrics()).record(job.timing)
+        if job.source is not None:
+            self._sources.setdefault(job.source, {}).setdefault(
+                name, TransmitMetrics()
+            ).record(job.timing)
+
+    async def _async_worker(self) -> None:
+        """Write queued commands to the transport in priority order."""
+        loop = self._hass.loop
+        last_sent: float | None = None
+        while True:
+            if (
+                last_sent is not None
+                and (delay := self._gap - (time.monotonic() - last_sent)) > 0
+            ):
+                await asyncio.sleep(delay)
+
+            await self._connected.wait()
+            job = await self._queue.get()
+            if job.future.done():
+                continue
+            if not self.connected:
+                # Paused while waiting for the command, hold it again
+                self._queue.put_nowait(job)
+                continue
+
+            lane = self._lanes[job.priority]
+            timing = job.timing
+            timing.dispatched = time.monotonic()
+            wait = timing.dispatched - timing.queued
+            lane.sent += 1
+            lane.total_wait += wait
+            lane.max_wait = max(lane.max_wait, wait)
+
+            try:
+                await loop.run_in_executor(
+                    self._executor,
+                    _write,
+                    timing,
+                    job.not_before,
+                    job.fun,
+                    self._get_transport(),
+                    *job.args,
+                )
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if not job.future.done():
+                    job.future.set_exception(err)
+            else:
+                self._async_record(job)
+                if not job.future.done():
+                    job.future.set_result(timing)
+            last_sent = time.monotonic()